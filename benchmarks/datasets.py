@@ -0,0 +1,71 @@
+import os
+import secrets
+from typing import Dict, List, Tuple
+from sqlalchemy import insert
+from src.models.account import AccountCreate
+from src.models.database import ApiKey, DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.auth import KEY_PREFIX_LENGTH, AuthService
+from src.services.encryption import EncryptionService
+from .harness import Workspace
+
+# 실행마다 같은 alias, 조회 순서가 나오도록 난수 시드를 고정한다
+SEED = 20240601
+
+def account_rows(count: int, prefix: str = "account") -> List[AccountCreate]:
+    return [
+        AccountCreate(
+            alias=f"{prefix}-{index:07d}",
+            username=f"user{index}@example.com",
+            password=secrets.token_urlsafe(16)
+        )
+        for index in range(count)
+    ]
+
+class Datasets:
+    # 크기별 계정 DB를 한 번만 만들고 마이크로 벤치마크와 부하 시나리오가 같이 쓴다
+    def __init__(self, workspace: Workspace, encryption_service: EncryptionService):
+        self.workspace = workspace
+        self.encryption_service = encryption_service
+        self._accounts: Dict[Tuple[int, str], List[str]] = {}
+    
+    def accounts_db(self, count: int, mode: str = "columns") -> str:
+        if mode == "columns":
+            return self.workspace.file(f"accounts_{count}.db")
+        return self.workspace.file(f"accounts_{mode}_{count}.db")
+    
+    def accounts(self, count: int, mode: str = "columns") -> List[str]:
+        # mode는 ACCOUNT_STORAGE_MODE와 같은 값 (columns 또는 payload)
+        aliases = self._accounts.get((count, mode))
+        if aliases is None:
+            db_manager = DatabaseManager(db_path=self.accounts_db(count, mode))
+            try:
+                manager = AccountManager(db_manager, self.encryption_service, payload_mode=mode == "payload")
+                rows = account_rows(count)
+                result = manager.import_accounts(rows)
+                if result.failed:
+                    raise RuntimeError(f"Failed to seed {result.failed} accounts")
+            finally:
+                db_manager.dispose()
+            aliases = self._accounts[(count, mode)] = [row.alias for row in rows]
+        return aliases
+
+def seed_api_keys(auth_service: AuthService, count: int, chunk_size: int = 5000) -> List[str]:
+    # create_api_key는 키마다 커밋하므로 대량 데이터는 같은 형식의 행을 한 번에 넣는다
+    keys = [auth_service.generate_api_key() for _ in range(count)]
+    session = auth_service.db_manager.get_session()
+    try:
+        for start in range(0, count, chunk_size):
+            session.execute(insert(ApiKey), [
+                {
+                    "key_name": f"bench-{start + offset}-{os.getpid()}",
+                    "key_prefix": key[:KEY_PREFIX_LENGTH],
+                    "key_hash": auth_service.hash_api_key(key),
+                    "is_active": True
+                }
+                for offset, key in enumerate(keys[start:start + chunk_size])
+            ])
+        session.commit()
+    finally:
+        auth_service.db_manager.close_session(session)
+    return keys
\ No newline at end of file
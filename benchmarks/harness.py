@@ -0,0 +1,115 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(samples: Sequence[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def latency_result(samples: Sequence[float], scale: float = 1e6, unit: str = "us") -> Dict:
+    # 대표값은 p50이고 낮을수록 좋다. 나머지 값은 비교하지 않고 참고용으로만 남긴다.
+    total = sum(samples)
+    return {
+        "value": round(percentile(samples, 0.5) * scale, 3),
+        "unit": unit,
+        "better": "lower",
+        "p99": round(percentile(samples, 0.99) * scale, 3),
+        "mean": round(total / len(samples) * scale, 3) if samples else 0.0,
+        "ops_per_sec": round(len(samples) / total, 1) if total else 0.0,
+        "samples": len(samples)
+    }
+
+def throughput_result(value: float, unit: str, **extra) -> Dict:
+    return {"value": round(value, 3), "unit": unit, "better": "higher", **extra}
+
+def cost_result(value: float, unit: str, **extra) -> Dict:
+    return {"value": round(value, 3), "unit": unit, "better": "lower", **extra}
+
+def measure(func: Callable[[], object], duration: float = 1.0, warmup: float = 0.1,
+            max_calls: Optional[int] = None) -> Dict:
+    # 호출마다 시간을 재서 분포를 구한다 (perf_counter 오버헤드는 100ns 안팎이라 µs 단위 작업에는 무시할 만하다)
+    deadline = time.perf_counter() + warmup
+    while time.perf_counter() < deadline:
+        func()
+    
+    samples: List[float] = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline and (max_calls is None or len(samples) < max_calls):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return latency_result(samples)
+
+def environment_info() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+class Workspace:
+    # 벤치마크용 DB, 키 파일은 임시 디렉터리에 만든다 (저장소의 auth_tool.db, encryption.key를 건드리지 않는다)
+    def __init__(self, keep: bool = False):
+        self.path = tempfile.mkdtemp(prefix="auth_tool_bench_")
+        self.keep = keep
+    
+    def file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+    
+    def cleanup(self):
+        if not self.keep:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+class BenchmarkRun:
+    def __init__(self, options: Dict):
+        self.meta = {**environment_info(), "options": options}
+        self.results: Dict[str, Dict] = {}
+    
+    def add(self, name: str, result: Dict):
+        self.results[name] = result
+        print(f"{name:<64} {result['value']:>14,.3f} {result['unit']}", flush=True)
+    
+    def to_dict(self) -> Dict:
+        return {"meta": self.meta, "results": self.results}
+    
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+def load_results(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def compare_results(current: Dict[str, Dict], baseline: Dict[str, Dict],
+                    threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    # (이름, 기준값, 현재값, 변화율, 회귀 여부). 변화율은 나빠진 방향이 양수가 되도록 부호를 맞춘다.
+    rows = []
+    for name in sorted(set(current) & set(baseline)):
+        before, after = baseline[name]["value"], current[name]["value"]
+        lower_is_better = current[name].get("better", "lower") == "lower"
+        if before == 0:
+            change = float("inf") if lower_is_better and after > 0 else 0.0
+        else:
+            change = (after - before) / before
+            if not lower_is_better:
+                change = -change
+        rows.append((name, before, after, change, change > threshold))
+    return rows
\ No newline at end of file
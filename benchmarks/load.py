@@ -0,0 +1,82 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, List, Sequence, Tuple
+import httpx
+from anyio import to_thread
+from config import config
+from src.api.dependencies import ServiceContainer, get_container, init_container, shutdown_container
+from src.api.main import app
+from src.models.account import ApiKeyCreate
+from src.models.database import DatabaseManager
+from src.services import metrics
+from .datasets import SEED, Datasets
+from .harness import BenchmarkRun, percentile, throughput_result
+
+RequestFactory = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+async def drive(client: httpx.AsyncClient, make_request: RequestFactory, total: int,
+                concurrency: int) -> Tuple[List[float], int, float]:
+    # concurrency개의 가상 클라이언트가 요청을 하나씩 꺼내 보내고 응답을 기다린다 (closed-loop)
+    remaining = total
+    latencies: List[float] = []
+    errors = 0
+    
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            response = await make_request(client)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+async def _run_dataset(run: BenchmarkRun, size: int, aliases: Sequence[str], api_key: str,
+                       clients: Sequence[int], requests_per_client: int, min_requests: int):
+    # 네트워크와 HTTP 파싱은 빼고 ASGI 앱, 미들웨어, 스레드풀, 서비스 계층 전체를 거친다
+    to_thread.current_default_thread_limiter().total_tokens = config.THREADPOOL_SIZE
+    rng = random.Random(SEED)
+    headers = {"X-API-Key": api_key}
+    scenarios = {
+        "get_account": lambda client: client.get(f"/accounts/{rng.choice(aliases)}", headers=headers),
+        "list_accounts": lambda client: client.get(
+            "/accounts", params={"limit": 100, "after": rng.randrange(max(size - 100, 1))}, headers=headers
+        ),
+        "validate": lambda client: client.post("/auth/validate", headers=headers),
+    }
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, make_request in scenarios.items():
+            await drive(client, make_request, min(50, min_requests), 1)
+            for concurrency in clients:
+                total = max(min_requests, concurrency * requests_per_client)
+                latencies, errors, elapsed = await drive(client, make_request, total, concurrency)
+                run.add(f"load.{name}[n={size},clients={concurrency}]", throughput_result(
+                    len(latencies) / elapsed,
+                    "req/s",
+                    p50_ms=round(percentile(latencies, 0.5) * 1000, 3),
+                    p99_ms=round(percentile(latencies, 0.99) * 1000, 3),
+                    requests=len(latencies),
+                    errors=errors
+                ))
+
+def run_load(run: BenchmarkRun, datasets: Datasets, sizes: Sequence[int], clients: Sequence[int],
+             requests_per_client: int = 20, min_requests: int = 500):
+    for size in sizes:
+        aliases = datasets.accounts(size)
+        # 컨테이너는 작업 디렉터리의 같은 encryption.key로 자체 EncryptionService를 만든다
+        init_container(ServiceContainer(
+            db_manager=DatabaseManager(db_path=datasets.accounts_db(size), poolclass=metrics.InstrumentedQueuePool)
+        ))
+        try:
+            auth_service = get_container().auth_service
+            api_key = auth_service.create_api_key(ApiKeyCreate(key_name=f"load-{size}")).api_key
+            asyncio.run(_run_dataset(run, size, aliases, api_key, clients, requests_per_client, min_requests))
+        finally:
+            shutdown_container()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import random
+from typing import Sequence
+from config import config
+from src.models.database import DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.auth import AuthService
+from src.services.encryption import EncryptionService
+from .datasets import SEED, Datasets, seed_api_keys
+from .harness import BenchmarkRun, Workspace, measure
+
+def bench_crypto(run: BenchmarkRun, encryption_service: EncryptionService, duration: float):
+    plaintext = "user1234@example.com"
+    token = encryption_service.encrypt(plaintext)
+    run.add("crypto.encrypt", measure(lambda: encryption_service.encrypt(plaintext), duration))
+    run.add("crypto.decrypt", measure(lambda: encryption_service.decrypt(token), duration))
+    
+    # 계정 목록 전체 복호화처럼 큰 배치는 워커 풀로 나뉜다 (값은 배치 하나의 처리 시간)
+    tokens = [encryption_service.encrypt(f"user{index}@example.com") for index in range(1000)]
+    run.add("crypto.decrypt_many[batch=1000]", measure(lambda: encryption_service.decrypt_many(tokens), duration))
+
+def bench_api_keys(run: BenchmarkRun, workspace: Workspace, key_count: int, duration: float):
+    db_manager = DatabaseManager(db_path=workspace.file(f"api_keys_{key_count}.db"))
+    try:
+        # last_used는 버퍼에만 쌓이도록 플러시 스레드를 시작하지 않는다
+        auth_service = AuthService(
+            db_manager,
+            cache_size=config.API_KEY_CACHE_SIZE,
+            cache_ttl=config.API_KEY_CACHE_TTL,
+            last_used_flush_interval=3600
+        )
+        run.add("auth.generate_api_key", measure(auth_service.generate_api_key, duration))
+        
+        keys = seed_api_keys(auth_service, key_count)
+        rng = random.Random(SEED)
+        hot_keys = rng.sample(keys, min(100, len(keys)))
+        run.add(
+            f"auth.validate_api_key[cached,keys={key_count}]",
+            measure(lambda: auth_service.validate_api_key(rng.choice(hot_keys)), duration)
+        )
+        
+        uncached = AuthService(db_manager, cache_size=0, last_used_flush_interval=3600, secret=auth_service.secret)
+        run.add(
+            f"auth.validate_api_key[uncached,keys={key_count}]",
+            measure(lambda: uncached.validate_api_key(rng.choice(keys)), duration)
+        )
+        invalid_key = auth_service.generate_api_key()
+        run.add(
+            f"auth.validate_api_key[invalid,keys={key_count}]",
+            measure(lambda: uncached.validate_api_key(invalid_key), duration)
+        )
+    finally:
+        db_manager.dispose()
+
+def bench_payload_account(run: BenchmarkRun, datasets: Datasets, size: int, rng: random.Random, duration: float):
+    # 위의 uncached 항목(columns 모드)과 같은 조건에서 계정당 암호문이 하나인 payload 모드를 잰다
+    aliases = datasets.accounts(size, mode="payload")
+    db_manager = DatabaseManager(db_path=datasets.accounts_db(size, mode="payload"))
+    try:
+        manager = AccountManager(db_manager, datasets.encryption_service, payload_mode=True)
+        run.add(
+            f"accounts.get_account[payload,n={size}]",
+            measure(lambda: manager.get_account(rng.choice(aliases)), duration)
+        )
+    finally:
+        db_manager.dispose()
+
+def bench_accounts(run: BenchmarkRun, datasets: Datasets, sizes: Sequence[int], duration: float):
+    for size in sizes:
+        aliases = datasets.accounts(size)
+        db_manager = DatabaseManager(db_path=datasets.accounts_db(size))
+        try:
+            rng = random.Random(SEED)
+            manager = AccountManager(db_manager, datasets.encryption_service)
+            run.add(
+                f"accounts.get_account[uncached,n={size}]",
+                measure(lambda: manager.get_account(rng.choice(aliases)), duration)
+            )
+            bench_payload_account(run, datasets, size, rng, duration)
+            
+            cached = AccountManager(db_manager, datasets.encryption_service, cache_size=1024)
+            hot_aliases = rng.sample(aliases, min(100, len(aliases)))
+            run.add(
+                f"accounts.get_account[cached,n={size}]",
+                measure(lambda: cached.get_account(rng.choice(hot_aliases)), duration)
+            )
+            
+            batch_size = min(100, size)
+            run.add(
+                f"accounts.get_accounts[batch={batch_size},n={size}]",
+                measure(lambda: manager.get_accounts(rng.sample(aliases, batch_size)), duration)
+            )
+            run.add(
+                f"accounts.list_accounts[limit=100,n={size}]",
+                measure(lambda: manager.list_accounts(after_id=rng.randrange(max(size - 100, 1)), limit=100), duration)
+            )
+        finally:
+            db_manager.dispose()
+
+def run_micro(run: BenchmarkRun, workspace: Workspace, datasets: Datasets, sizes: Sequence[int],
+              key_count: int, duration: float):
+    bench_crypto(run, datasets.encryption_service, duration)
+    bench_api_keys(run, workspace, key_count, duration)
+    bench_accounts(run, datasets, sizes, duration)
\ No newline at end of file
@@ -0,0 +1,134 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from src.models.account import ApiKeyCreate
+from src.models.database import DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.auth import AuthService
+from src.services.encryption import EncryptionService
+from .datasets import account_rows
+from .harness import ROOT, BenchmarkRun, Workspace, cost_result, latency_result, throughput_result
+
+COLD_START_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+from src.api.main import app
+from src.api.dependencies import ServiceContainer
+imported = time.perf_counter()
+container = ServiceContainer()
+ready = time.perf_counter()
+container.close()
+print(json.dumps({{"import": imported - started, "container": ready - imported}}))
+"""
+
+def bench_cold_start(run: BenchmarkRun, workspace: Workspace, runs: int):
+    # 워커 프로세스 하나가 뜰 때 드는 시간: 모듈 import와 서비스 컨테이너 생성(키 로드, 스키마 확인)
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{workspace.file('cold_start.db')}")
+    script = COLD_START_SCRIPT.format(root=ROOT)
+    imports, containers = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", script], cwd=workspace.path, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        timings = json.loads(output.strip().splitlines()[-1])
+        imports.append(timings["import"])
+        containers.append(timings["container"])
+    run.add("startup.import", latency_result(imports, scale=1000, unit="ms"))
+    run.add("startup.container", latency_result(containers, scale=1000, unit="ms"))
+
+def _create_keys(db_path: str, worker: int, count: int, barrier, results):
+    created = errors = 0
+    started = None
+    try:
+        db_manager = DatabaseManager(db_path=db_path)
+        auth_service = AuthService(db_manager, last_used_flush_interval=3600)
+        # 프로세스 기동(import) 시간은 빼고 모든 워커가 동시에 쓰기 시작하도록 맞춘다
+        barrier.wait(timeout=120)
+        started = time.time()
+        try:
+            for index in range(count):
+                try:
+                    auth_service.create_api_key(ApiKeyCreate(key_name=f"stress-{worker}-{index}"))
+                    created += 1
+                except Exception:
+                    errors += 1
+        finally:
+            db_manager.dispose()
+    finally:
+        # 준비 단계에서 실패해도 결과는 보내야 부모 프로세스가 기다리지 않는다
+        finished = time.time()
+        results.put((created, count - created, started or finished, finished))
+
+def bench_lock_stress(run: BenchmarkRun, workspace: Workspace, processes: int, keys_per_process: int):
+    # 여러 프로세스가 같은 SQLite 파일에 동시에 쓸 때 "database is locked" 오류가 나지 않는지 본다
+    db_path = workspace.file("lock_stress.db")
+    # 스키마와 api_key.secret은 미리 만들어 둬야 워커들이 같은 시크릿을 읽는다
+    db_manager = DatabaseManager(db_path=db_path)
+    AuthService(db_manager, last_used_flush_interval=3600)
+    db_manager.dispose()
+    
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(processes)
+    queue = context.Queue()
+    workers = [
+        context.Process(target=_create_keys, args=(db_path, worker, keys_per_process, barrier, queue))
+        for worker in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    
+    created = sum(result[0] for result in results)
+    errors = sum(result[1] for result in results)
+    elapsed = max(result[3] for result in results) - min(result[2] for result in results)
+    run.add(
+        f"lock_stress.create_api_key[processes={processes}]",
+        throughput_result(created / elapsed, "keys/s", created=created, errors=errors)
+    )
+    run.add(f"lock_stress.errors[processes={processes}]", cost_result(errors, "errors"))
+
+def bench_storage(run: BenchmarkRun, workspace: Workspace, encryption_service: EncryptionService, count: int):
+    # 저장 방식별 가져오기 처리량과 계정당 DB 크기 (WAL을 체크포인트한 뒤의 파일 크기)
+    rows = account_rows(count)
+    for mode in ("columns", "payload"):
+        db_path = workspace.file(f"storage_{mode}_{count}.db")
+        db_manager = DatabaseManager(db_path=db_path)
+        try:
+            manager = AccountManager(db_manager, encryption_service, payload_mode=mode == "payload")
+            started = time.perf_counter()
+            manager.import_accounts(rows)
+            elapsed = time.perf_counter() - started
+        finally:
+            db_manager.dispose()
+        
+        # 파일 크기는 페이지 단위로 늘어나므로 행에 들어간 암호문 길이를 따로 잰다
+        connection = sqlite3.connect(db_path)
+        try:
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            connection.execute("VACUUM")
+            ciphertext_bytes = connection.execute(
+                "SELECT SUM(LENGTH(encrypted_username) + LENGTH(encrypted_password)"
+                " + COALESCE(LENGTH(encrypted_payload), 0) + COALESCE(LENGTH(encrypted_data_key), 0))"
+                " FROM accounts"
+            ).fetchone()[0]
+        finally:
+            connection.close()
+        run.add(f"storage.import[{mode},n={count}]", throughput_result(count / elapsed, "accounts/s"))
+        run.add(
+            f"storage.bytes_per_account[{mode},n={count}]",
+            cost_result(ciphertext_bytes / count, "bytes", file_bytes_per_account=round(os.path.getsize(db_path) / count, 1))
+        )
+
+def run_system(run: BenchmarkRun, workspace: Workspace, encryption_service: EncryptionService,
+               storage_size: int, cold_start_runs: int, processes: int, keys_per_process: int):
+    bench_cold_start(run, workspace, cold_start_runs)
+    bench_lock_stress(run, workspace, processes, keys_per_process)
+    bench_storage(run, workspace, encryption_service, storage_size)
\ No newline at end of file
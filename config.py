@@ -6,6 +6,29 @@ load_dotenv()
 class Config:
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///auth_tool.db")
     
+    # 동기 핸들러를 실행하는 스레드풀 크기 (요청 하나는 DB 연결을 한 번에 하나만 쓴다)
+    THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", 40))
+    # 요청 외에 DB 연결을 쓰는 백그라운드 스레드: last_used 플러시, 키 교체, change_log 정리, 키 폐기 감시
+    BACKGROUND_DB_THREADS = 4
+    
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    # 기본값은 스레드풀과 백그라운드 스레드가 모두 연결을 쥐어도 풀에서 기다리지 않는 크기다
+    DB_MAX_OVERFLOW = int(
+        os.getenv("DB_MAX_OVERFLOW") or max(THREADPOOL_SIZE + BACKGROUND_DB_THREADS - DB_POOL_SIZE, 0)
+    )
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    
+    # SQLite 성능 프로필: 연결마다 PRAGMA로 적용된다 (빈 값이면 해당 PRAGMA 생략)
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+        "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-20000"),
+    }
+    
     MASTER_KEY = os.getenv("MASTER_KEY", None)
     
     API_HOST = os.getenv("API_HOST", "127.0.0.1")
@@ -18,9 +41,42 @@ class Config:
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
     
     ENCRYPTION_KEY_FILE = os.getenv("ENCRYPTION_KEY_FILE", "encryption.key")
+    KDF_CACHE_FILE = os.getenv("KDF_CACHE_FILE", None)
+    KDF_CACHE_SEAL_KEY = os.getenv("KDF_CACHE_SEAL_KEY", None)
+    KEYRING_FILE = os.getenv("KEYRING_FILE", "encryption.keyring")
+    # columns: 필드별 암호문, payload: 계정당 암호문 하나
+    ACCOUNT_STORAGE_MODE = os.getenv("ACCOUNT_STORAGE_MODE", "columns")
+    LAZY_REENCRYPT = os.getenv("LAZY_REENCRYPT", "true").lower() == "true"
+    KEY_ROTATION_CHUNK_SIZE = int(os.getenv("KEY_ROTATION_CHUNK_SIZE", 200))
+    
+    API_KEY_SECRET = os.getenv("API_KEY_SECRET", None)
+    API_KEY_SECRET_FILE = os.getenv("API_KEY_SECRET_FILE", "api_key.secret")
     
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     
+    API_KEY_CACHE_SIZE = int(os.getenv("API_KEY_CACHE_SIZE", 1024))
+    API_KEY_CACHE_TTL = float(os.getenv("API_KEY_CACHE_TTL", 60))
+    API_KEY_REVOCATION_POLL_INTERVAL = float(os.getenv("API_KEY_REVOCATION_POLL_INTERVAL", 2))
+    LIST_MAX_LIMIT = int(os.getenv("LIST_MAX_LIMIT", 1000))
+    BATCH_GET_MAX_ALIASES = int(os.getenv("BATCH_GET_MAX_ALIASES", 200))
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 500))
+    CRYPTO_WORKERS = int(os.getenv("CRYPTO_WORKERS", 4))
+    ACCOUNT_CACHE_SIZE = int(os.getenv("ACCOUNT_CACHE_SIZE", 0))
+    ACCOUNT_CACHE_TTL = float(os.getenv("ACCOUNT_CACHE_TTL", 30))
+    LAST_USED_FLUSH_INTERVAL = float(os.getenv("LAST_USED_FLUSH_INTERVAL", 30))
+    CHANGE_FEED_POLL_INTERVAL = float(os.getenv("CHANGE_FEED_POLL_INTERVAL", 1))
+    CHANGE_FEED_MAX_WAIT = float(os.getenv("CHANGE_FEED_MAX_WAIT", 30))
+    CHANGE_FEED_HEARTBEAT = float(os.getenv("CHANGE_FEED_HEARTBEAT", 15))
+    CHANGE_FEED_LAG = float(os.getenv("CHANGE_FEED_LAG", 5))
+    CHANGE_FEED_RETENTION_DAYS = float(os.getenv("CHANGE_FEED_RETENTION_DAYS", 7))
+    CHANGE_FEED_PRUNE_INTERVAL = float(os.getenv("CHANGE_FEED_PRUNE_INTERVAL", 3600))
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0.01))
+    PROFILING_MODE = os.getenv("PROFILING_MODE", "cprofile")
+    PROFILING_SAMPLE_INTERVAL = float(os.getenv("PROFILING_SAMPLE_INTERVAL", 0.005))
+    PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN", "")
+    
     @classmethod
     def get_database_path(cls):
         if cls.DATABASE_URL.startswith("sqlite:///"):
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import csv
+import json
+from typing import Iterator, List, TextIO
+from pydantic import ValidationError
+from config import config
+from src.models.account import AccountCreate, AccountBulkResult
+from src.models.database import DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.encryption import EncryptionService
+
+def iter_json_array(f: TextIO, read_size: int = 1 << 16) -> Iterator:
+    # JSON 배열 파일 전체를 메모리에 올리지 않고 원소를 하나씩 디코딩한다
+    decoder = json.JSONDecoder()
+    buffer, position, eof = "", 0, False
+    
+    def next_char() -> str:
+        # 공백을 건너뛰고 다음 문자를 돌려준다 (파일 끝이면 빈 문자열)
+        nonlocal buffer, position, eof
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return buffer[position:position + 1]
+            buffer, position = f.read(read_size), 0
+            eof = not buffer
+    
+    def expect(allowed: str) -> str:
+        nonlocal position
+        char = next_char()
+        if not char or char not in allowed:
+            raise ValueError(f"Expected one of {allowed!r} in JSON array, got {char or 'end of file'!r}")
+        position += 1
+        return char
+    
+    expect("[")
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+                # 원소 뒤에는 구분자가 와야 한다. 숫자가 읽은 부분의 끝에서 잘렸을 수 있으므로 그때는 더 읽고 다시 디코딩한다
+                if eof or (end < len(buffer) and (buffer[end] in ",]" or buffer[end].isspace())):
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            chunk = f.read(read_size)
+            buffer, position, eof = buffer[position:] + chunk, 0, not chunk
+        position = end
+        yield value
+        if expect(",]") == "]":
+            return
+
+def read_rows(path: str, file_format: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if file_format == "csv":
+            yield from csv.DictReader(f)
+        elif file_format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+def detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "json"
+
+def main():
+    parser = argparse.ArgumentParser(description="계정 정보를 CSV/JSON 파일에서 일괄 가져옵니다.")
+    parser.add_argument("path", help="alias, username, password 필드를 가진 CSV, JSON 배열 또는 JSON Lines 파일")
+    parser.add_argument("--format", choices=["csv", "json", "jsonl"], help="파일 형식 (기본값: 확장자로 판단)")
+    parser.add_argument("--upsert", action="store_true", help="이미 존재하는 alias는 덮어씁니다")
+    parser.add_argument("--chunk-size", type=int, default=config.BULK_IMPORT_CHUNK_SIZE, help="트랜잭션당 행 수")
+    parser.add_argument("--workers", type=int, default=config.CRYPTO_WORKERS, help="암호화 작업 스레드 수")
+    args = parser.parse_args()
+
+    invalid: List[AccountBulkResult] = []
+
+    def valid_rows() -> Iterator[AccountCreate]:
+        for index, row in enumerate(read_rows(args.path, args.format or detect_format(args.path)), start=1):
+            try:
+                yield AccountCreate(**row)
+            except (TypeError, ValidationError) as e:
+                alias = row.get("alias") if isinstance(row, dict) else None
+                invalid.append(AccountBulkResult(alias=alias or f"#{index}", status="error", detail=str(e)))
+
+    account_manager = AccountManager(
+        DatabaseManager(),
+        EncryptionService(workers=args.workers),
+        payload_mode=config.ACCOUNT_STORAGE_MODE == "payload"
+    )
+    report = account_manager.import_accounts(
+        valid_rows(),
+        upsert=args.upsert,
+        chunk_size=args.chunk_size
+    )
+
+    for result in invalid + report.results:
+        if result.status == "error":
+            print(f"✗ {result.alias}: {result.detail}")
+
+    print(f"생성: {report.created}, 수정: {report.updated}, 실패: {report.failed + len(invalid)}")
+    print(f"소요 시간: {report.elapsed_seconds:.2f}초 ({report.rows_per_second:.0f} 행/초)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import shutil
+import time
+from config import config
+from src.models.database import DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.encryption import EncryptionService
+
+def migrate_to_master_key(chunk_size: int) -> int:
+    # 서버와 관리 UI를 모두 멈춘 뒤 실행한다. 키 파일은 .migrated로 이름을 바꿔 두므로
+    # 중간에 실패해도 같은 명령을 다시 실행하면 남은 계정부터 이어서 옮긴다
+    if not config.MASTER_KEY:
+        print("MASTER_KEY가 설정되지 않았습니다.")
+        return 1
+    key_file = config.ENCRYPTION_KEY_FILE
+    old_key_file = f"{key_file}.migrated"
+    if os.path.exists(key_file):
+        os.replace(key_file, old_key_file)
+    elif not os.path.exists(old_key_file):
+        print(f"{key_file} 파일이 없어 옮길 계정이 없습니다.")
+        return 1
+
+    # 키링의 교체된 마스터 키도 이전 버전 1 키로 래핑돼 있으므로 사본을 남기고 새 키로 다시 래핑한다
+    keyring_file = config.KEYRING_FILE
+    old_keyring_file = f"{keyring_file}.migrated"
+    if os.path.exists(keyring_file) and not os.path.exists(old_keyring_file):
+        shutil.copy2(keyring_file, old_keyring_file)
+    old_encryption = EncryptionService(master_key="", key_file=old_key_file, keyring_file=old_keyring_file)
+    if old_encryption.rotated_keys:
+        # 새 키만 파생하도록 아직 없는 키링 경로를 준다
+        new_key = EncryptionService(keyring_file=f"{keyring_file}.pending")
+        new_key.write_keyring(keyring_file, old_encryption.active_version, old_encryption.rotated_keys)
+
+    db_manager = DatabaseManager()
+    payload_mode = config.ACCOUNT_STORAGE_MODE == "payload"
+    source = AccountManager(db_manager, old_encryption, payload_mode=payload_mode)
+    target = AccountManager(db_manager, EncryptionService(), payload_mode=payload_mode)
+    started = time.perf_counter()
+    migrated = target.migrate_from(source, chunk_size=chunk_size)
+    print(f"MASTER_KEY로 옮긴 계정: {migrated}개 ({time.perf_counter() - started:.2f}초)")
+    print(f"이전 키 파일은 {old_key_file}에 남겨 두었습니다. 모든 계정을 확인한 뒤 삭제하세요.")
+    if os.path.exists(old_keyring_file):
+        print(f"이전 키링은 {old_keyring_file}에 남겨 두었습니다. 함께 삭제하세요.")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="이전 형식으로 저장된 계정을 현재 암호화 형식과 ACCOUNT_STORAGE_MODE에 맞게 다시 저장합니다."
+    )
+    parser.add_argument("--chunk-size", type=int, default=500, help="트랜잭션당 계정 수")
+    parser.add_argument("--to-master-key", action="store_true",
+                        help="ENCRYPTION_KEY_FILE로 암호화된 계정을 MASTER_KEY 파생 키로 다시 암호화")
+    args = parser.parse_args()
+
+    if args.to_master_key:
+        return migrate_to_master_key(args.chunk_size)
+
+    account_manager = AccountManager(
+        DatabaseManager(),
+        EncryptionService(),
+        payload_mode=config.ACCOUNT_STORAGE_MODE == "payload"
+    )
+
+    print(f"저장 방식: {config.ACCOUNT_STORAGE_MODE}")
+    started = time.perf_counter()
+    upgraded = account_manager.reencrypt_outdated(chunk_size=args.chunk_size)
+    print(f"변환된 계정: {upgraded}개 ({time.perf_counter() - started:.2f}초)")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+from benchmarks.harness import BenchmarkRun, Workspace, compare_results, load_results
+
+SUITES = ("micro", "load", "system")
+
+def parse_list(value: str) -> list:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="서비스, 암호화, API 경로의 성능을 측정하고 JSON으로 저장합니다.")
+    parser.add_argument("--suite", action="append", choices=SUITES, help="실행할 묶음 (여러 번 지정 가능, 기본값: 전체)")
+    parser.add_argument("--quick", action="store_true", help="작은 데이터셋과 짧은 측정 시간으로 빠르게 실행")
+    parser.add_argument("--sizes", type=parse_list, help="계정 데이터셋 크기 (기본값: 100,1000,10000 / quick: 100,1000)")
+    parser.add_argument("--api-keys", type=int, help="API 키 검증 시 DB에 넣을 키 수 (기본값: 100000 / quick: 10000)")
+    parser.add_argument("--clients", type=parse_list, help="부하 시나리오 동시 클라이언트 수 (기본값: 1,16,128)")
+    parser.add_argument("--duration", type=float, help="마이크로 벤치마크당 측정 시간(초) (기본값: 1.0 / quick: 0.3)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="기준보다 이 비율 이상 나빠지면 회귀로 보고 종료 코드 1을 반환 (기본값: 0.2)")
+    parser.add_argument("--keep-workspace", action="store_true", help="임시 DB/키 파일을 지우지 않음")
+    args = parser.parse_args()
+    
+    suites = args.suite or list(SUITES)
+    sizes = args.sizes or ([100, 1000] if args.quick else [100, 1000, 10000])
+    api_keys = args.api_keys or (10000 if args.quick else 100000)
+    clients = args.clients or [1, 16, 128]
+    duration = args.duration or (0.3 if args.quick else 1.0)
+    baseline = load_results(args.baseline)["results"] if args.baseline else None
+    
+    # 서비스들이 encryption.key, api_key.secret 등을 현재 디렉터리에 만들므로 config를 읽기 전에 임시 작업 디렉터리로 옮긴다
+    workspace = Workspace(keep=args.keep_workspace)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workspace.file('bench.db')}"
+    os.environ["PROFILING_ENABLED"] = "false"
+    os.environ.pop("MASTER_KEY", None)
+    os.chdir(workspace.path)
+    
+    from benchmarks.datasets import Datasets
+    from benchmarks.load import run_load
+    from benchmarks.micro import run_micro
+    from benchmarks.system import run_system
+    from src.services.encryption import EncryptionService
+    
+    run = BenchmarkRun({
+        "suites": suites, "sizes": sizes, "api_keys": api_keys, "clients": clients,
+        "duration": duration, "quick": args.quick
+    })
+    encryption_service = EncryptionService()
+    datasets = Datasets(workspace, encryption_service)
+    try:
+        if "micro" in suites:
+            run_micro(run, workspace, datasets, sizes, api_keys, duration)
+        if "load" in suites:
+            run_load(run, datasets, sizes, clients, requests_per_client=10 if args.quick else 20,
+                     min_requests=200 if args.quick else 500)
+        if "system" in suites:
+            run_system(
+                run, workspace, encryption_service,
+                storage_size=1000 if args.quick else 10000,
+                cold_start_runs=3 if args.quick else 5,
+                processes=4 if args.quick else 8,
+                keys_per_process=20 if args.quick else 50
+            )
+    finally:
+        encryption_service.close()
+        workspace.cleanup()
+    
+    if args.output:
+        run.save(args.output)
+        print(f"\n결과 저장: {args.output}")
+    
+    if baseline is None:
+        return 0
+    
+    print(f"\n기준 결과와 비교 (허용 범위 {args.threshold:.0%}):")
+    regressions = 0
+    for name, before, after, change, regressed in compare_results(run.results, baseline, args.threshold):
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"{name:<64} {before:>14,.3f} -> {after:>14,.3f} {change:>+8.1%}  {marker}")
+        regressions += regressed
+    if regressions:
+        print(f"\n{regressions}개 항목이 기준보다 {args.threshold:.0%} 이상 나빠졌습니다.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
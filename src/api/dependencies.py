@@ -0,0 +1,112 @@
+import threading
+from fastapi import Depends
+from typing import Optional
+from config import config
+from ..models.database import DatabaseManager
+from ..services.account_manager import AccountManager
+from ..services.auth import AuthService
+from ..services.changes import ChangeFeed
+from ..services.encryption import EncryptionService
+from ..services.key_rotation import KeyRotationJob
+from ..services import metrics
+
+class ServiceContainer:
+    def __init__(self, db_manager: Optional[DatabaseManager] = None,
+                 encryption_service: Optional[EncryptionService] = None):
+        self.db_manager = db_manager or DatabaseManager(poolclass=metrics.InstrumentedQueuePool)
+        metrics.instrument_engine(self.db_manager.engine)
+        self.encryption_service = encryption_service or EncryptionService()
+        self.account_manager = AccountManager(
+            self.db_manager,
+            self.encryption_service,
+            cache_size=config.ACCOUNT_CACHE_SIZE,
+            cache_ttl=config.ACCOUNT_CACHE_TTL,
+            lazy_upgrade=config.LAZY_REENCRYPT,
+            payload_mode=config.ACCOUNT_STORAGE_MODE == "payload"
+        )
+        self.key_rotation = KeyRotationJob(self.account_manager, chunk_size=config.KEY_ROTATION_CHUNK_SIZE)
+        self.auth_service = AuthService(
+            self.db_manager,
+            cache_size=config.API_KEY_CACHE_SIZE,
+            cache_ttl=config.API_KEY_CACHE_TTL,
+            last_used_flush_interval=config.LAST_USED_FLUSH_INTERVAL,
+            revocation_poll_interval=config.API_KEY_REVOCATION_POLL_INTERVAL
+        )
+        self.auth_service.last_used.start()
+        self.auth_service.revocations.start()
+        self.change_feed = ChangeFeed(
+            self.db_manager,
+            lag=config.CHANGE_FEED_LAG,
+            retention=config.CHANGE_FEED_RETENTION_DAYS * 86400,
+            prune_interval=config.CHANGE_FEED_PRUNE_INTERVAL
+        )
+        self.change_feed.start()
+        metrics.registry.add_collector(self.collect_metrics)
+    
+    def cache_stats(self) -> dict:
+        return {
+            "api_keys": self.auth_service.key_cache.stats(),
+            "accounts": self.account_manager.account_cache.stats()
+        }
+    
+    def collect_metrics(self):
+        for cache_name, stats in self.cache_stats().items():
+            cache_hits.set(stats["hits"], cache=cache_name)
+            cache_misses.set(stats["misses"], cache=cache_name)
+            cache_hit_ratio.set(stats["hit_ratio"], cache=cache_name)
+            cache_entries.set(stats["size"], cache=cache_name)
+        pool = self.db_manager.engine.pool
+        if hasattr(pool, "checkedout"):
+            db_pool_connections.set(pool.checkedout(), state="checked_out")
+            db_pool_connections.set(pool.checkedin(), state="idle")
+            # QueuePool.overflow()는 풀이 덜 찼을 때 음수이므로 초과 연결 수만 보고한다
+            db_pool_connections.set(max(pool.overflow(), 0), state="overflow")
+    
+    def close(self):
+        metrics.registry.remove_collector(self.collect_metrics)
+        self.key_rotation.stop()
+        self.auth_service.revocations.stop()
+        self.auth_service.last_used.stop()
+        self.change_feed.stop()
+        self.account_manager.account_cache.clear()
+        self.encryption_service.close()
+        self.db_manager.dispose()
+
+cache_hits = metrics.registry.gauge("auth_tool_cache_hits", "Cache hits since startup", ("cache",))
+cache_misses = metrics.registry.gauge("auth_tool_cache_misses", "Cache misses since startup", ("cache",))
+cache_hit_ratio = metrics.registry.gauge("auth_tool_cache_hit_ratio", "Cache hit ratio since startup", ("cache",))
+cache_entries = metrics.registry.gauge("auth_tool_cache_entries", "Entries currently cached", ("cache",))
+db_pool_connections = metrics.registry.gauge("auth_tool_db_pool_connections", "DB pool connections by state", ("state",))
+
+_container: Optional[ServiceContainer] = None
+_container_lock = threading.Lock()
+
+def init_container(container: Optional[ServiceContainer] = None) -> ServiceContainer:
+    global _container
+    if _container is None:
+        with _container_lock:
+            if _container is None:
+                _container = container or ServiceContainer()
+    return _container
+
+def shutdown_container():
+    global _container
+    with _container_lock:
+        if _container is not None:
+            _container.close()
+            _container = None
+
+def get_container() -> ServiceContainer:
+    return init_container()
+
+def get_account_manager(container: ServiceContainer = Depends(get_container)) -> AccountManager:
+    return container.account_manager
+
+def get_auth_service(container: ServiceContainer = Depends(get_container)) -> AuthService:
+    return container.auth_service
+
+def get_key_rotation(container: ServiceContainer = Depends(get_container)) -> KeyRotationJob:
+    return container.key_rotation
+
+def get_change_feed(container: ServiceContainer = Depends(get_container)) -> ChangeFeed:
+    return container.change_feed
@@ -1,11 +1,33 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from config import config
+from ..services import metrics
 from .routes import router
+from .dependencies import init_container, shutdown_container
+from .middleware import MetricsMiddleware, ProfilingMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # DB/암호화 작업은 동기 핸들러로 스레드풀에서 실행되므로 풀 크기를 설정값에 맞춘다
+    to_thread.current_default_thread_limiter().total_tokens = config.THREADPOOL_SIZE
+    started = time.perf_counter()
+    app.state.container = init_container()
+    logging.getLogger("uvicorn.error").info(
+        "Service container ready in %.1f ms", (time.perf_counter() - started) * 1000
+    )
+    yield
+    shutdown_container()
 
 app = FastAPI(
     title="Personal Account Management API",
     description="Secure API for managing encrypted personal accounts",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -16,6 +38,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
+# 프로파일링을 쓰지 않으면 미들웨어 자체를 넣지 않는다
+if config.PROFILING_ENABLED or config.PROFILING_ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(router)
 
 @app.get("/")
@@ -30,6 +58,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint():
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
@@ -1,13 +1,16 @@
+import asyncio
+import hmac
+import random
+import time
 from fastapi import HTTPException, Header, Depends
+from fastapi.routing import APIRoute
 from typing import Optional
+from config import config
+from ..services import metrics, profiling
 from ..services.auth import AuthService
+from .dependencies import get_auth_service
 
-def get_auth_service() -> AuthService:
-    from ..models.database import DatabaseManager
-    db_manager = DatabaseManager()
-    return AuthService(db_manager)
-
-async def verify_api_key(
+def verify_api_key(
     x_api_key: Optional[str] = Header(None),
     auth_service: AuthService = Depends(get_auth_service)
 ) -> str:
@@ -23,4 +26,69 @@ async def verify_api_key(
             detail="Invalid or inactive API key"
         )
     
-    return x_api_key
\ No newline at end of file
+    return x_api_key
+
+class MetricsMiddleware:
+    # 경로 파라미터별로 시계열이 늘어나지 않도록 실제 URL 대신 매칭된 라우트 경로로 집계한다
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            metrics.http_requests.inc(method=scope["method"], route=route_path, status=status_code)
+            metrics.http_duration.observe(time.perf_counter() - started, method=scope["method"], route=route_path)
+
+class ProfiledRoute(APIRoute):
+    # 동기 엔드포인트를 프로파일링 래퍼로 감싼다. 결과는 "메서드 경로" 단위로 집계된다.
+    # include_router가 라우트를 다시 만들 때 이미 감싼 엔드포인트는 그대로 둔다.
+    def __init__(self, path: str, endpoint, **kwargs):
+        if not asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "__profiled__", False):
+            methods = ",".join(sorted(kwargs.get("methods") or ["GET"]))
+            endpoint = profiling.profiled(f"{methods} {path}", endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+class ProfilingMiddleware:
+    # 설정된 비율만큼, 또는 X-Profile-Token 헤더가 PROFILING_ADMIN_TOKEN과 일치하는 요청을 프로파일링 대상으로 표시한다
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        mode = self._requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        
+        token = profiling.current_mode.set(mode)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiling.current_mode.reset(token)
+    
+    def _requested_mode(self, scope) -> Optional[str]:
+        if config.PROFILING_ADMIN_TOKEN:
+            headers = dict(scope["headers"])
+            token = headers.get(b"x-profile-token")
+            if token is not None and hmac.compare_digest(token, config.PROFILING_ADMIN_TOKEN.encode()):
+                mode = headers.get(b"x-profile-mode", b"").decode("latin-1").lower()
+                return mode if mode in profiling.MODES else config.PROFILING_MODE
+        
+        if config.PROFILING_ENABLED and random.random() < config.PROFILING_SAMPLE_RATE:
+            return config.PROFILING_MODE
+        return None
\ No newline at end of file
@@ -1,101 +1,345 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import asyncio
+import hashlib
+import time
+from config import config
 from ..models.account import (
     AccountCreate, AccountUpdate, AccountResponse, 
-    AccountInfo, ApiKeyCreate, ApiKeyResponse
+    AccountInfo, ApiKeyCreate, ApiKeyResponse,
+    AccountBatchRequest, AccountBatchResponse, AccountBulkRequest, AccountBulkResponse,
+    ChangeFeedResponse
 )
 from ..services.account_manager import AccountManager
 from ..services.auth import AuthService
-from ..services.encryption import EncryptionService
-from ..models.database import DatabaseManager
-from .middleware import verify_api_key
+from ..services.changes import ChangeFeed, ChangeFeedExpired
+from ..services.key_rotation import KeyRotationJob
+from .dependencies import (
+    ServiceContainer, get_container, get_account_manager, get_auth_service, get_key_rotation,
+    get_change_feed
+)
+from ..services import profiling
+from .middleware import verify_api_key, ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
 
-router = APIRouter()
+# 계정 정보는 자격 증명이므로 공유 캐시에는 저장하지 않고, 클라이언트는 항상 ETag로 재검증한다
+CACHE_CONTROL = "private, no-cache"
 
-def get_dependencies():
-    db_manager = DatabaseManager()
-    encryption_service = EncryptionService()
-    account_manager = AccountManager(db_manager, encryption_service)
-    auth_service = AuthService(db_manager)
-    return account_manager, auth_service
+def _etag(*parts) -> str:
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+def _not_modified(if_none_match: Optional[str], etag: str) -> Optional[Response]:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags or f"W/{etag}" in tags:
+            return Response(status_code=304, headers=headers)
+    return None
 
 @router.post("/auth/validate")
 async def validate_api_key(api_key: str = Depends(verify_api_key)):
     return {"valid": True, "message": "API key is valid"}
 
 @router.get("/accounts/{alias}", response_model=AccountResponse)
-async def get_account(alias: str, api_key: str = Depends(verify_api_key)):
-    account_manager, _ = get_dependencies()
-    account = account_manager.get_account(alias)
-    if not account:
+def get_account(
+    alias: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
+):
+    version = None
+    if if_none_match:
+        # 조건부 요청일 때만 복호화 없이 버전을 먼저 조회해 304로 끝낼 수 있는지 본다
+        version = account_manager.get_account_version(alias)
+        if not version:
+            raise HTTPException(status_code=404, detail="Account not found")
+        
+        not_modified = _not_modified(if_none_match, _etag("account", *version))
+        if not_modified:
+            return not_modified
+    
+    result = account_manager.get_account_with_version(alias, version)
+    if not result:
         raise HTTPException(status_code=404, detail="Account not found")
+    account, version = result
+    # ETag는 실제로 읽은 행의 버전으로 만든다 (버전 조회 뒤에 계정이 바뀌었을 수도 있다)
+    response.headers.update({"ETag": _etag("account", *version), "Cache-Control": CACHE_CONTROL})
     return account
 
+@router.post("/accounts/batch-get", response_model=AccountBatchResponse)
+def get_accounts(
+    request: AccountBatchRequest,
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
+):
+    if len(request.aliases) > config.BATCH_GET_MAX_ALIASES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many aliases (max {config.BATCH_GET_MAX_ALIASES})"
+        )
+    return account_manager.get_accounts(request.aliases)
+
 @router.post("/accounts", response_model=AccountInfo)
-async def create_account(
+def create_account(
     account: AccountCreate,
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
 ):
-    account_manager, _ = get_dependencies()
     try:
         return account_manager.create_account(account)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/accounts/bulk", response_model=AccountBulkResponse)
+def import_accounts(
+    request: AccountBulkRequest,
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
+):
+    return account_manager.import_accounts(
+        request.accounts,
+        upsert=request.upsert,
+        chunk_size=config.BULK_IMPORT_CHUNK_SIZE
+    )
+
 @router.put("/accounts/{alias}", response_model=AccountInfo)
-async def update_account(
+def update_account(
     alias: str,
     account: AccountUpdate,
-    api_key: str = Depends(verify_api_key)
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
 ):
-    account_manager, _ = get_dependencies()
     updated_account = account_manager.update_account(alias, account)
     if not updated_account:
         raise HTTPException(status_code=404, detail="Account not found")
     return updated_account
 
 @router.delete("/accounts/{alias}")
-async def delete_account(alias: str, api_key: str = Depends(verify_api_key)):
-    account_manager, _ = get_dependencies()
+def delete_account(
+    alias: str,
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
+):
     if not account_manager.delete_account(alias):
         raise HTTPException(status_code=404, detail="Account not found")
     return {"message": f"Account '{alias}' deleted successfully"}
 
+def _paginate(items: list, limit: Optional[int], response: Response, cursor_of) -> list:
+    if limit is not None and len(items) > limit:
+        items = items[:limit]
+        response.headers["X-Next-Cursor"] = str(cursor_of(items[-1]))
+    return items
+
 @router.get("/accounts", response_model=List[AccountInfo])
-async def list_accounts(api_key: str = Depends(verify_api_key)):
-    account_manager, _ = get_dependencies()
-    return account_manager.list_accounts()
+def list_accounts(
+    response: Response,
+    after: Optional[int] = Query(None, description="이전 페이지 마지막 id (X-Next-Cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=config.LIST_MAX_LIMIT),
+    prefix: Optional[str] = Query(None, min_length=1),
+    if_none_match: Optional[str] = Header(None),
+    api_key: str = Depends(verify_api_key),
+    account_manager: AccountManager = Depends(get_account_manager)
+):
+    etag = _etag("accounts", after, limit, prefix, *account_manager.get_collection_version(prefix))
+    not_modified = _not_modified(if_none_match, etag)
+    if not_modified:
+        return not_modified
+    
+    accounts = account_manager.list_accounts(
+        after_id=after,
+        limit=limit + 1 if limit is not None else None,
+        prefix=prefix
+    )
+    response.headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return _paginate(accounts, limit, response, lambda account: account.id)
+
+@router.get("/changes", response_model=ChangeFeedResponse)
+async def list_changes(
+    since: Optional[int] = Query(None, ge=0, description="이전 응답의 cursor (생략하면 현재 커서만 반환)"),
+    limit: int = Query(config.LIST_MAX_LIMIT, ge=1, le=config.LIST_MAX_LIMIT),
+    resource: Optional[str] = Query(None, description="account 또는 api_key"),
+    wait: float = Query(0, ge=0, le=config.CHANGE_FEED_MAX_WAIT, description="변경이 없을 때 기다릴 최대 시간(초)"),
+    api_key: str = Depends(verify_api_key),
+    change_feed: ChangeFeed = Depends(get_change_feed)
+):
+    if since is None:
+        return ChangeFeedResponse(changes=[], cursor=await run_in_threadpool(change_feed.head))
+    
+    # long-poll은 스레드풀을 점유하지 않도록 이벤트 루프에서 대기하고 조회만 스레드풀에서 실행한다
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            changes, since = await run_in_threadpool(change_feed.list_changes, since, limit, resource)
+        except ChangeFeedExpired as e:
+            raise HTTPException(status_code=410, detail=f"{e}; fetch the full list and restart from a new cursor")
+        remaining = deadline - time.monotonic()
+        if changes or remaining <= 0:
+            break
+        await asyncio.sleep(min(config.CHANGE_FEED_POLL_INTERVAL, remaining))
+    
+    return ChangeFeedResponse(changes=changes, cursor=since)
+
+@router.get("/changes/stream")
+async def stream_changes(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    resource: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+    api_key: str = Depends(verify_api_key),
+    auth_service: AuthService = Depends(get_auth_service),
+    change_feed: ChangeFeed = Depends(get_change_feed)
+):
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = await run_in_threadpool(change_feed.head)
+    
+    async def events():
+        cursor = since
+        idle = 0.0
+        validated = time.monotonic()
+        while not await request.is_disconnected():
+            # 연결이 열려 있는 동안 키가 비활성화되거나 삭제되면 스트림을 끝낸다
+            if time.monotonic() - validated >= config.CHANGE_FEED_HEARTBEAT:
+                if not await run_in_threadpool(auth_service.validate_api_key, api_key):
+                    yield "event: unauthorized\ndata: Invalid or inactive API key\n\n"
+                    return
+                validated = time.monotonic()
+            try:
+                changes, next_cursor = await run_in_threadpool(
+                    change_feed.list_changes, cursor, config.LIST_MAX_LIMIT, resource
+                )
+            except ChangeFeedExpired as e:
+                yield f"event: expired\ndata: {e.horizon}\n\n"
+                return
+            for change in changes:
+                yield f"id: {change.id}\nevent: change\ndata: {change.model_dump_json()}\n\n"
+            if next_cursor != cursor:
+                # 다른 resource의 변경만 있었어도 커서가 전진했으면 바로 다음 구간을 읽는다
+                cursor = next_cursor
+                if changes:
+                    idle = 0.0
+                continue
+            
+            await asyncio.sleep(config.CHANGE_FEED_POLL_INTERVAL)
+            idle += config.CHANGE_FEED_POLL_INTERVAL
+            if idle >= config.CHANGE_FEED_HEARTBEAT:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @router.post("/admin/api-keys", response_model=ApiKeyResponse)
-async def create_api_key(key_data: ApiKeyCreate):
-    _, auth_service = get_dependencies()
+def create_api_key(
+    key_data: ApiKeyCreate,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     try:
         return auth_service.create_api_key(key_data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/admin/api-keys", response_model=List[ApiKeyResponse])
-async def list_api_keys():
-    _, auth_service = get_dependencies()
-    return auth_service.list_api_keys()
+def list_api_keys(
+    response: Response,
+    after: Optional[int] = Query(None, description="이전 페이지 마지막 id (X-Next-Cursor)"),
+    limit: Optional[int] = Query(None, ge=1, le=config.LIST_MAX_LIMIT),
+    prefix: Optional[str] = Query(None, min_length=1),
+    if_none_match: Optional[str] = Header(None),
+    auth_service: AuthService = Depends(get_auth_service)
+):
+    api_keys = auth_service.list_api_keys(
+        after_id=after,
+        limit=limit + 1 if limit is not None else None,
+        prefix=prefix
+    )
+    # API 키에는 updated_at이 없으므로 응답에 담기는 변경 가능한 필드로 ETag를 만든다
+    etag = _etag("api-keys", *((api_key.id, api_key.key_name, api_key.is_active) for api_key in api_keys))
+    not_modified = _not_modified(if_none_match, etag)
+    if not_modified:
+        return not_modified
+    
+    response.headers.update({"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return _paginate(api_keys, limit, response, lambda api_key: api_key.id)
 
 @router.post("/admin/api-keys/{key_name}/deactivate")
-async def deactivate_api_key(key_name: str):
-    _, auth_service = get_dependencies()
+def deactivate_api_key(
+    key_name: str,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     if not auth_service.deactivate_api_key(key_name):
         raise HTTPException(status_code=404, detail="API key not found")
     return {"message": f"API key '{key_name}' deactivated"}
 
 @router.post("/admin/api-keys/{key_name}/activate")
-async def activate_api_key(key_name: str):
-    _, auth_service = get_dependencies()
+def activate_api_key(
+    key_name: str,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     if not auth_service.activate_api_key(key_name):
         raise HTTPException(status_code=404, detail="API key not found")
     return {"message": f"API key '{key_name}' activated"}
 
 @router.delete("/admin/api-keys/{key_name}")
-async def delete_api_key(key_name: str):
-    _, auth_service = get_dependencies()
+def delete_api_key(
+    key_name: str,
+    auth_service: AuthService = Depends(get_auth_service)
+):
     if not auth_service.delete_api_key(key_name):
         raise HTTPException(status_code=404, detail="API key not found")
-    return {"message": f"API key '{key_name}' deleted"}
\ No newline at end of file
+    return {"message": f"API key '{key_name}' deleted"}
+
+@router.get("/admin/cache/stats")
+async def cache_stats(container: ServiceContainer = Depends(get_container)):
+    return container.cache_stats()
+
+@router.post("/admin/keys/rotate")
+def rotate_master_key(key_rotation: KeyRotationJob = Depends(get_key_rotation)):
+    if not key_rotation.rotate():
+        raise HTTPException(status_code=409, detail="Key rotation is already running")
+    return key_rotation.progress()
+
+@router.post("/admin/keys/rotation/resume")
+def resume_key_rotation(key_rotation: KeyRotationJob = Depends(get_key_rotation)):
+    if not key_rotation.start():
+        raise HTTPException(status_code=409, detail="Key rotation is already running")
+    return key_rotation.progress()
+
+@router.get("/admin/keys/rotation")
+def key_rotation_progress(key_rotation: KeyRotationJob = Depends(get_key_rotation)):
+    return key_rotation.progress()
+
+@router.get("/admin/profiles")
+def list_profiles():
+    return profiling.profile_store.summary()
+
+@router.get("/admin/profiles/download")
+def download_profile(
+    route: str = Query(..., description='집계 키 (예: "GET /accounts/{alias}")'),
+    format: str = Query("pstats", pattern="^(pstats|collapsed)$")
+):
+    if format == "pstats":
+        content = profiling.profile_store.export_pstats(route)
+        media_type, extension = "application/octet-stream", "prof"
+    else:
+        content = profiling.profile_store.export_collapsed(route)
+        media_type, extension = "text/plain", "collapsed"
+    if content is None:
+        raise HTTPException(status_code=404, detail="No profile data for this route")
+    
+    filename = "".join(char if char.isalnum() else "_" for char in route).strip("_")
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+@router.delete("/admin/profiles")
+def clear_profiles():
+    profiling.profile_store.clear()
+    return {"message": "Profile data cleared"}
\ No newline at end of file
@@ -0,0 +1,209 @@
+import asyncio
+import httpx
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from .auth_client import NotFoundError, _client_error
+
+class AsyncAuthClient:
+    # 하나의 httpx.AsyncClient(커넥션 풀)를 재사용하고, 동시 요청 수는 세마포어로 제한한다
+    def __init__(self, api_key: str, base_url: str = "http://127.0.0.1:8000",
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 10.0, max_concurrency: int = 50,
+                 http2: bool = False, validator_cache_size: int = 256,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-API-Key": api_key},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            timeout=httpx.Timeout(timeout),
+            http2=http2,
+            transport=transport
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.validator_cache_size = validator_cache_size
+        self._validators: Dict[Tuple, httpx.Response] = {}
+    
+    async def __aenter__(self) -> "AsyncAuthClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        await self.client.aclose()
+    
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        async with self.semaphore:
+            return await self.client.request(method, endpoint, **kwargs)
+    
+    async def _conditional_get(self, endpoint: str, params: Optional[Dict] = None) -> httpx.Response:
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self._validators.get(key)
+        headers = {"If-None-Match": cached.headers["ETag"]} if cached is not None else {}
+        
+        response = await self._make_request("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached
+        
+        self._validators.pop(key, None)
+        if response.status_code == 200 and "ETag" in response.headers and self.validator_cache_size > 0:
+            while len(self._validators) >= self.validator_cache_size:
+                self._validators.pop(next(iter(self._validators)))
+            self._validators[key] = response
+        return response
+    
+    def clear_validators(self):
+        self._validators.clear()
+    
+    async def validate_api_key(self) -> bool:
+        try:
+            response = await self._make_request("POST", "/auth/validate")
+            return response.status_code == 200
+        except Exception:
+            return False
+    
+    async def get_account(self, alias: str) -> Optional[Dict[str, str]]:
+        try:
+            response = await self._conditional_get(f"/accounts/{alias}")
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                return None
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error(f"Failed to get account '{alias}'", e) from e
+    
+    async def get_accounts(self, aliases: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        try:
+            response = await self._make_request("POST", "/accounts/batch-get", json={"aliases": list(aliases)})
+            if response.status_code == 200:
+                found = {account["alias"]: account for account in response.json()["accounts"]}
+                return {alias: found.get(alias) for alias in aliases}
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to get accounts", e) from e
+    
+    async def get_accounts_chunked(self, aliases: List[str], batch_size: int = 200) -> Dict[str, Optional[Dict[str, str]]]:
+        # 서버의 batch-get 한도를 넘는 목록은 나눠서 동시에 요청한다 (동시 요청 수는 세마포어가 제한)
+        results = await asyncio.gather(*(
+            self.get_accounts(aliases[start:start + batch_size])
+            for start in range(0, len(aliases), batch_size)
+        ))
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return {alias: merged.get(alias) for alias in aliases}
+    
+    async def create_account(self, alias: str, username: str, password: str) -> Dict:
+        try:
+            data = {
+                "alias": alias,
+                "username": username,
+                "password": password
+            }
+            response = await self._make_request("POST", "/accounts", json=data)
+            if response.status_code == 200:
+                return response.json()
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error(f"Failed to create account '{alias}'", e) from e
+    
+    async def import_accounts(self, accounts: List[Dict[str, str]], upsert: bool = False) -> Dict:
+        try:
+            response = await self._make_request(
+                "POST", "/accounts/bulk", json={"accounts": list(accounts), "upsert": upsert}
+            )
+            if response.status_code == 200:
+                return response.json()
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to import accounts", e) from e
+    
+    async def update_account(self, alias: str, username: Optional[str] = None, password: Optional[str] = None) -> Dict:
+        try:
+            data = {}
+            if username:
+                data["username"] = username
+            if password:
+                data["password"] = password
+            
+            response = await self._make_request("PUT", f"/accounts/{alias}", json=data)
+            if response.status_code == 200:
+                return response.json()
+            elif response.status_code == 404:
+                raise NotFoundError(f"Account '{alias}' not found", 404)
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error(f"Failed to update account '{alias}'", e) from e
+    
+    async def delete_account(self, alias: str) -> bool:
+        try:
+            response = await self._make_request("DELETE", f"/accounts/{alias}")
+            if response.status_code == 200:
+                return True
+            elif response.status_code == 404:
+                return False
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error(f"Failed to delete account '{alias}'", e) from e
+    
+    async def list_accounts(self, prefix: Optional[str] = None, limit: Optional[int] = None,
+                            after: Optional[int] = None) -> list:
+        return (await self._list_accounts_page(prefix, limit, after))[0]
+    
+    async def iter_accounts(self, page_size: int = 100, prefix: Optional[str] = None) -> AsyncIterator[Dict]:
+        after = None
+        while True:
+            accounts, after = await self._list_accounts_page(prefix, page_size, after)
+            for account in accounts:
+                yield account
+            if after is None:
+                return
+    
+    async def _list_accounts_page(self, prefix: Optional[str], limit: Optional[int],
+                                  after: Optional[int]) -> Tuple[list, Optional[int]]:
+        params = {"prefix": prefix, "limit": limit, "after": after}
+        try:
+            response = await self._conditional_get(
+                "/accounts",
+                params={key: value for key, value in params.items() if value is not None}
+            )
+            if response.status_code == 200:
+                next_cursor = response.headers.get("X-Next-Cursor")
+                return response.json(), int(next_cursor) if next_cursor else None
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to list accounts", e) from e
+    
+    async def get_changes(self, since: Optional[int] = None, wait: float = 0, resource: Optional[str] = None,
+                          limit: Optional[int] = None) -> Tuple[list, int]:
+        params = {"since": since, "wait": wait or None, "resource": resource, "limit": limit}
+        try:
+            # long-poll은 세마포어 슬롯을 오래 점유하므로 제한 없이 보낸다
+            response = await self.client.get(
+                "/changes",
+                params={key: value for key, value in params.items() if value is not None},
+                timeout=wait + 30 if wait else httpx.USE_CLIENT_DEFAULT
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data["changes"], data["cursor"]
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to get changes", e) from e
+
+def create_async_client(api_key: str, server_url: str = "http://127.0.0.1:8000", **kwargs) -> AsyncAuthClient:
+    return AsyncAuthClient(api_key, server_url, **kwargs)
\ No newline at end of file
@@ -1,29 +1,245 @@
 import requests
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Dict, Iterator, List, Tuple, Union
+from urllib.parse import urlsplit
 import json
+import random
+import threading
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+class AuthClientError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+class AuthenticationError(AuthClientError):
+    pass
+
+class NotFoundError(AuthClientError):
+    pass
+
+class ServerError(AuthClientError):
+    pass
+
+class ServiceUnavailableError(AuthClientError):
+    pass
+
+class CircuitOpenError(ServiceUnavailableError):
+    pass
+
+# 비동기 클라이언트(httpx)의 오류도 같은 예외 계층으로 바꾼다
+HTTP_STATUS_ERRORS = (requests.HTTPError,) + ((httpx.HTTPStatusError,) if httpx else ())
+TRANSPORT_ERRORS = (requests.RequestException,) + ((httpx.TransportError,) if httpx else ())
+
+def _client_error(message: str, error: Exception) -> AuthClientError:
+    # 호출한 작업 이름을 붙이되 원래 예외 종류와 상태 코드는 유지한다
+    if isinstance(error, AuthClientError):
+        return type(error)(f"{message}: {error}", error.status_code)
+    if isinstance(error, HTTP_STATUS_ERRORS) and error.response is not None:
+        status_code = error.response.status_code
+        if status_code in (401, 403):
+            error_class = AuthenticationError
+        elif status_code == 404:
+            error_class = NotFoundError
+        elif status_code >= 500:
+            error_class = ServerError
+        else:
+            error_class = AuthClientError
+        return error_class(f"{message}: {error}", status_code)
+    if isinstance(error, TRANSPORT_ERRORS):
+        return ServiceUnavailableError(f"{message}: {error}")
+    return AuthClientError(f"{message}: {error}")
+
+class CircuitBreaker:
+    # 연속 실패가 failure_threshold번 쌓이면 reset_timeout 동안 요청을 보내지 않고,
+    # 이후 한 요청만 시험 삼아 보내 성공하면 다시 닫는다
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+    
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+    
+    def release(self):
+        # 결과를 판정하지 못한 채 끝난 시험 요청(인터럽트 등)은 다음 요청이 다시 시험할 수 있게만 한다
+        with self._lock:
+            self._probing = False
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    # 같은 서버를 쓰는 클라이언트 인스턴스들은 하나의 서킷 브레이커를 공유한다
+    host = urlsplit(base_url).netloc
+    with _circuit_breakers_lock:
+        if host not in _circuit_breakers:
+            _circuit_breakers[host] = CircuitBreaker()
+        return _circuit_breakers[host]
 
 class AuthClient:
-    def __init__(self, api_key: str, base_url: str = "http://127.0.0.1:8000"):
+    def __init__(self, api_key: str, base_url: str = "http://127.0.0.1:8000", validator_cache_size: int = 256,
+                 timeout: Union[float, Tuple[float, float]] = (3.05, 10.0), max_retries: int = 3,
+                 backoff_base: float = 0.2, backoff_max: float = 5.0,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 on_request: Optional[Callable[[Dict], None]] = None):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
         self.session.headers.update({"X-API-Key": api_key})
+        self.validator_cache_size = validator_cache_size
+        self._validators: Dict[Tuple, requests.Response] = {}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url)
+        self.on_request = on_request
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+    def _make_request(self, method: str, endpoint: str, idempotent: Optional[bool] = None,
+                      **kwargs) -> requests.Response:
         url = f"{self.base_url}{endpoint}"
-        response = self.session.request(method, url, **kwargs)
+        kwargs.setdefault("timeout", self.timeout)
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        max_attempts = self.max_retries + 1 if idempotent else 1
+        
+        started = time.perf_counter()
+        attempt = 0
+        response = None
+        error = None
+        try:
+            while True:
+                attempt += 1
+                if not self.circuit_breaker.allow():
+                    error = CircuitOpenError(f"Circuit open for {url}")
+                    raise error
+                
+                response, error = None, None
+                fatal = False
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                except requests.RequestException as e:
+                    # ChunkedEncodingError, TooManyRedirects 등은 재시도하지 않지만 실패로는 기록한다
+                    error = e
+                    fatal = True
+                except BaseException:
+                    self.circuit_breaker.release()
+                    raise
+                
+                # 허용된 요청은 반드시 성공/실패 중 하나를 기록해야 half-open 시험 상태가 풀린다
+                if error is None and response.status_code < 500:
+                    self.circuit_breaker.record_success()
+                else:
+                    self.circuit_breaker.record_failure()
+                
+                retryable = not fatal and (error is not None or response.status_code in RETRY_STATUS_CODES)
+                if not retryable or attempt >= max_attempts:
+                    break
+                time.sleep(self._backoff(attempt, response))
+            
+            if error is not None:
+                raise ServiceUnavailableError(f"{method} {url} failed after {attempt} attempt(s): {error}") from error
+            return response
+        finally:
+            self._report(method, endpoint, response, error, attempt, time.perf_counter() - started)
+    
+    def _backoff(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # full jitter: 여러 봇이 같은 박자로 재시도하지 않도록 0부터 상한 사이에서 무작위로 기다린다
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+    
+    def _report(self, method: str, endpoint: str, response: Optional[requests.Response],
+                error: Optional[Exception], attempts: int, elapsed: float):
+        if self.on_request is None:
+            return
+        try:
+            self.on_request({
+                "method": method,
+                "endpoint": endpoint,
+                "status_code": response.status_code if response is not None else None,
+                "error": type(error).__name__ if error is not None else None,
+                "attempts": attempts,
+                "retries": attempts - 1,
+                "elapsed": elapsed,
+                "circuit_state": self.circuit_breaker.state,
+            })
+        except Exception:
+            pass
+    
+    def _conditional_get(self, endpoint: str, params: Optional[Dict] = None) -> requests.Response:
+        # 변경되지 않은 리소스는 304만 받고 이전 응답을 그대로 돌려준다
+        key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self._validators.get(key)
+        headers = {"If-None-Match": cached.headers["ETag"]} if cached is not None else {}
+        
+        response = self._make_request("GET", endpoint, params=params, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cached
+        
+        self._validators.pop(key, None)
+        if response.status_code == 200 and "ETag" in response.headers and self.validator_cache_size > 0:
+            while len(self._validators) >= self.validator_cache_size:
+                self._validators.pop(next(iter(self._validators)))
+            self._validators[key] = response
         return response
     
+    def clear_validators(self):
+        self._validators.clear()
+    
     def validate_api_key(self) -> bool:
         try:
-            response = self._make_request("POST", "/auth/validate")
+            response = self._make_request("POST", "/auth/validate", idempotent=True)
             return response.status_code == 200
         except Exception:
             return False
     
     def get_account(self, alias: str) -> Optional[Dict[str, str]]:
         try:
-            response = self._make_request("GET", f"/accounts/{alias}")
+            response = self._conditional_get(f"/accounts/{alias}")
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
@@ -31,7 +247,20 @@ class AuthClient:
             else:
                 response.raise_for_status()
         except Exception as e:
-            raise Exception(f"Failed to get account '{alias}': {str(e)}")
+            raise _client_error(f"Failed to get account '{alias}'", e) from e
+    
+    def get_accounts(self, aliases: List[str]) -> Dict[str, Optional[Dict[str, str]]]:
+        try:
+            response = self._make_request(
+                "POST", "/accounts/batch-get", json={"aliases": list(aliases)}, idempotent=True
+            )
+            if response.status_code == 200:
+                found = {account["alias"]: account for account in response.json()["accounts"]}
+                return {alias: found.get(alias) for alias in aliases}
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to get accounts", e) from e
     
     def create_account(self, alias: str, username: str, password: str) -> Dict:
         try:
@@ -46,7 +275,7 @@ class AuthClient:
             else:
                 response.raise_for_status()
         except Exception as e:
-            raise Exception(f"Failed to create account '{alias}': {str(e)}")
+            raise _client_error(f"Failed to create account '{alias}'", e) from e
     
     def update_account(self, alias: str, username: Optional[str] = None, password: Optional[str] = None) -> Dict:
         try:
@@ -60,11 +289,11 @@ class AuthClient:
             if response.status_code == 200:
                 return response.json()
             elif response.status_code == 404:
-                raise Exception(f"Account '{alias}' not found")
+                raise NotFoundError(f"Account '{alias}' not found", 404)
             else:
                 response.raise_for_status()
         except Exception as e:
-            raise Exception(f"Failed to update account '{alias}': {str(e)}")
+            raise _client_error(f"Failed to update account '{alias}'", e) from e
     
     def delete_account(self, alias: str) -> bool:
         try:
@@ -76,17 +305,113 @@ class AuthClient:
             else:
                 response.raise_for_status()
         except Exception as e:
-            raise Exception(f"Failed to delete account '{alias}': {str(e)}")
+            raise _client_error(f"Failed to delete account '{alias}'", e) from e
+    
+    def list_accounts(self, prefix: Optional[str] = None, limit: Optional[int] = None,
+                      after: Optional[int] = None) -> list:
+        return self._list_accounts_page(prefix, limit, after)[0]
+    
+    def iter_accounts(self, page_size: int = 100, prefix: Optional[str] = None) -> Iterator[Dict]:
+        after = None
+        while True:
+            accounts, after = self._list_accounts_page(prefix, page_size, after)
+            yield from accounts
+            if after is None:
+                return
     
-    def list_accounts(self) -> list:
+    def _list_accounts_page(self, prefix: Optional[str], limit: Optional[int],
+                            after: Optional[int]) -> Tuple[list, Optional[int]]:
+        params = {"prefix": prefix, "limit": limit, "after": after}
         try:
-            response = self._make_request("GET", "/accounts")
+            response = self._conditional_get(
+                "/accounts",
+                params={key: value for key, value in params.items() if value is not None}
+            )
             if response.status_code == 200:
-                return response.json()
+                next_cursor = response.headers.get("X-Next-Cursor")
+                return response.json(), int(next_cursor) if next_cursor else None
             else:
                 response.raise_for_status()
         except Exception as e:
-            raise Exception(f"Failed to list accounts: {str(e)}")
+            raise _client_error("Failed to list accounts", e) from e
+
+    def get_changes(self, since: Optional[int] = None, wait: float = 0, resource: Optional[str] = None,
+                    limit: Optional[int] = None) -> Tuple[list, int]:
+        params = {"since": since, "wait": wait or None, "resource": resource, "limit": limit}
+        try:
+            response = self._make_request(
+                "GET", "/changes",
+                params={key: value for key, value in params.items() if value is not None},
+                timeout=wait + 30 if wait else self.timeout
+            )
+            if response.status_code == 200:
+                data = response.json()
+                return data["changes"], data["cursor"]
+            else:
+                response.raise_for_status()
+        except Exception as e:
+            raise _client_error("Failed to get changes", e) from e
+
+class AccountMirror:
+    # 처음 한 번만 전체 목록을 받고, 이후에는 변경 피드로 바뀐 계정만 다시 가져온다
+    def __init__(self, client: AuthClient, page_size: int = 1000, batch_size: int = 200):
+        self.client = client
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.accounts: Dict[str, Dict[str, str]] = {}
+        self.cursor: Optional[int] = None
+    
+    def get(self, alias: str) -> Optional[Dict[str, str]]:
+        return self.accounts.get(alias)
+    
+    def sync(self, wait: float = 0) -> int:
+        try:
+            return self._sync(wait)
+        except AuthClientError as e:
+            if e.status_code != 410:
+                raise
+            # 커서 이후의 변경이 서버 보존 기간을 넘겨 정리됐으면 전체 목록부터 다시 받는다
+            self.cursor = None
+            return self._sync(wait)
+    
+    def _sync(self, wait: float) -> int:
+        if self.cursor is None:
+            # 목록을 받기 전의 커서부터 따라가므로 그 사이의 변경도 놓치지 않는다
+            cursor = self.client.get_changes()[1]
+            aliases = [account["alias"] for account in self.client.iter_accounts(page_size=self.page_size)]
+            for alias in set(self.accounts) - set(aliases):
+                self.accounts.pop(alias, None)
+            self._fetch(aliases)
+            self.cursor = cursor
+        
+        applied = 0
+        while True:
+            changes, cursor = self.client.get_changes(
+                self.cursor, wait=wait, resource="account", limit=self.page_size
+            )
+            changed = {}
+            for change in changes:
+                changed[change["key"]] = change["action"]
+            for alias, action in changed.items():
+                if action == "deleted":
+                    self.accounts.pop(alias, None)
+            self._fetch([alias for alias, action in changed.items() if action != "deleted"])
+            
+            applied += len(changes)
+            # 서버는 다른 리소스의 변경을 건너뛰거나 아직 커밋되지 않은 id 앞에서 멈추므로
+            # 받은 개수가 아니라 커서가 더 나아가지 않을 때를 따라잡은 것으로 본다
+            if cursor == self.cursor:
+                return applied
+            self.cursor = cursor
+            wait = 0
+    
+    def _fetch(self, aliases: List[str]):
+        for start in range(0, len(aliases), self.batch_size):
+            for alias, account in self.client.get_accounts(aliases[start:start + self.batch_size]).items():
+                if account is None:
+                    self.accounts.pop(alias, None)
+                else:
+                    self.accounts[alias] = account
 
 class AccountCredentials:
     def __init__(self, alias: str, username: str, password: str):
@@ -101,24 +426,203 @@ class AccountCredentials:
         return self.__str__()
 
 class SimpleAuthClient:
-    def __init__(self, api_key: str, base_url: str = "http://127.0.0.1:8000"):
-        self.client = AuthClient(api_key, base_url)
+    # cache_ttl > 0이면 계정 정보를 메모리에 캐시한다.
+    # TTL이 지난 뒤 stale_ttl 동안은 캐시 값을 바로 돌려주고 백그라운드 스레드에서 새로 받아온다.
+    # snapshot_path를 지정하면 받아온 계정 정보를 암호화된 로컬 스냅샷에도 저장하고,
+    # 서버에 연결할 수 없을 때와 프로세스 시작 직후(서버에서 아직 받지 않은 alias)에는 스냅샷 값을 쓴다.
+    def __init__(self, api_key: str, base_url: str = "http://127.0.0.1:8000", cache_ttl: float = 0,
+                 stale_ttl: float = 0, cache_size: int = 1024, snapshot_path: Optional[str] = None,
+                 snapshot_max_age: Optional[float] = None, **client_options):
+        self.client = AuthClient(api_key, base_url, **client_options)
+        self.client_options = client_options
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = stale_ttl
+        self.cache_size = cache_size
+        self.snapshot_max_age = snapshot_max_age
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "snapshot_hits": 0}
+        self._cache: Dict[str, Tuple[AccountCredentials, float]] = {}
+        self._refreshing = set()
+        self._fetched = set()
+        self._lock = threading.Lock()
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._refresh_client: Optional[AuthClient] = None
+        self.snapshot = None
+        if snapshot_path:
+            # 스냅샷을 쓰지 않는 클라이언트는 cryptography 없이도 동작하도록 필요할 때만 불러온다
+            from .snapshot import CredentialSnapshot
+            self.snapshot = CredentialSnapshot(snapshot_path, api_key)
     
     def get_credentials(self, alias: str) -> Optional[AccountCredentials]:
-        account_data = self.client.get_account(alias)
-        if account_data:
-            return AccountCredentials(
-                alias=account_data['alias'],
-                username=account_data['username'],
-                password=account_data['password']
-            )
-        return None
+        credentials = self._get_cached(alias)
+        if credentials is not None:
+            return credentials
+        
+        if alias not in self._fetched:
+            credentials = self._from_snapshot(alias)
+            if credentials is not None:
+                self._schedule_refresh(alias)
+                return credentials
+        return self._load(self.client, alias)
+    
+    def get_credentials_many(self, aliases: List[str]) -> Dict[str, Optional[AccountCredentials]]:
+        found = {}
+        for alias in aliases:
+            credentials = self._get_cached(alias)
+            if credentials is not None:
+                found[alias] = credentials
+        
+        pending = [alias for alias in aliases if alias not in found]
+        if pending:
+            try:
+                accounts = self.client.get_accounts(pending)
+            except AuthenticationError as e:
+                if e.status_code == 401:
+                    self._forget_all()
+                raise
+            except (ServiceUnavailableError, ServerError):
+                if self.snapshot is None:
+                    raise
+                # 서버 장애 시에는 스냅샷에 있는 계정만이라도 돌려준다
+                accounts = {}
+                for alias in pending:
+                    found[alias] = self._from_snapshot(alias)
+            for alias, data in accounts.items():
+                if data:
+                    found[alias] = self._store(alias, data)
+                else:
+                    self._forget(alias)
+        return {alias: found.get(alias) for alias in aliases}
+    
+    def invalidate(self, alias: Optional[str] = None):
+        with self._lock:
+            if alias is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(alias, None)
+    
+    def _forget(self, alias: str):
+        # 서버에서 삭제된 계정은 캐시와 스냅샷에서 모두 지운다
+        self.invalidate(alias)
+        if self.snapshot is not None:
+            self.snapshot.remove(alias)
+    
+    def _forget_all(self):
+        # API 키가 비활성화/삭제되면 캐시된 계정 정보도 더 이상 제공하지 않는다
+        self.invalidate()
+        if self.snapshot is not None:
+            self.snapshot.clear()
+    
+    def close(self):
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=False)
+            self._refresher = None
+        if self.snapshot is not None:
+            self.snapshot.close()
+    
+    def _get_cached(self, alias: str) -> Optional[AccountCredentials]:
+        if self.cache_ttl <= 0:
+            return None
+        
+        with self._lock:
+            entry = self._cache.get(alias)
+            age = time.monotonic() - entry[1] if entry else None
+            if entry is None or age >= self.cache_ttl + self.stale_ttl:
+                self.stats["misses"] += 1
+                return None
+            if age < self.cache_ttl:
+                self.stats["hits"] += 1
+                return entry[0]
+            
+            self.stats["stale_hits"] += 1
+        
+        self._schedule_refresh(alias)
+        return entry[0]
+    
+    def _schedule_refresh(self, alias: str):
+        with self._lock:
+            if alias in self._refreshing:
+                return
+            self._refreshing.add(alias)
+            if self._refresher is None:
+                # 백그라운드 갱신은 requests 세션을 공유하지 않도록 별도 클라이언트를 쓴다
+                self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="credential-refresh")
+                self._refresh_client = AuthClient(self.client.api_key, self.client.base_url, **self.client_options)
+            refresher = self._refresher
+        refresher.submit(self._refresh, alias)
+    
+    def _from_snapshot(self, alias: str) -> Optional[AccountCredentials]:
+        if self.snapshot is None:
+            return None
+        account_data = self.snapshot.load(alias, self.snapshot_max_age)
+        if account_data is None:
+            return None
+        with self._lock:
+            self.stats["snapshot_hits"] += 1
+        return AccountCredentials(
+            alias=account_data['alias'],
+            username=account_data['username'],
+            password=account_data['password']
+        )
+    
+    def _refresh(self, alias: str):
+        try:
+            self._load(self._refresh_client, alias)
+            with self._lock:
+                self.stats["refreshes"] += 1
+        except Exception:
+            # 갱신에 실패하면 stale 기간이 끝날 때까지 기존 값을 계속 쓴다
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(alias)
+    
+    def _load(self, client: AuthClient, alias: str) -> Optional[AccountCredentials]:
+        try:
+            response = client._conditional_get(f"/accounts/{alias}")
+        except ServiceUnavailableError as e:
+            credentials = self._from_snapshot(alias)
+            if credentials is not None:
+                return credentials
+            raise _client_error(f"Failed to get account '{alias}'", e) from e
+        
+        if response.status_code == 200:
+            return self._store(alias, response.json())
+        if response.status_code == 404:
+            self._forget(alias)
+            return None
+        error_class = AuthClientError
+        if response.status_code == 401:
+            self._forget_all()
+            error_class = AuthenticationError
+        elif response.status_code >= 500:
+            credentials = self._from_snapshot(alias)
+            if credentials is not None:
+                return credentials
+            error_class = ServerError
+        raise error_class(f"Failed to get account '{alias}': HTTP {response.status_code}", response.status_code)
+    
+    def _store(self, alias: str, account_data: Dict[str, str]) -> AccountCredentials:
+        credentials = AccountCredentials(
+            alias=account_data['alias'],
+            username=account_data['username'],
+            password=account_data['password']
+        )
+        if self.snapshot is not None:
+            self.snapshot.save(alias, account_data)
+        with self._lock:
+            self._fetched.add(alias)
+            if self.cache_ttl > 0:
+                self._cache.pop(alias, None)
+                while len(self._cache) >= self.cache_size:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[alias] = (credentials, time.monotonic())
+        return credentials
     
     def is_connected(self) -> bool:
         return self.client.validate_api_key()
 
-def create_client(api_key: str, server_url: str = "http://127.0.0.1:8000") -> SimpleAuthClient:
-    return SimpleAuthClient(api_key, server_url)
+def create_client(api_key: str, server_url: str = "http://127.0.0.1:8000", **kwargs) -> SimpleAuthClient:
+    return SimpleAuthClient(api_key, server_url, **kwargs)
 
 if __name__ == "__main__":
     client = SimpleAuthClient("your-api-key-here")
@@ -0,0 +1,118 @@
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+NONCE_SIZE = 12
+
+# 내용이 같으면 다시 암호화해 쓰지 않고, 이 주기마다 fetched_at만 갱신한다 (초)
+TOUCH_INTERVAL = 60
+
+class CredentialSnapshot:
+    # 조회한 계정 정보를 API 키에서 파생한 키(AES-256-GCM)로 암호화해 SQLite 파일에 보관한다.
+    # API 키는 무작위 64자이므로 느린 KDF 없이 파일별 salt와 HKDF로 충분하다.
+    def __init__(self, path: str, api_key: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._written: Dict[str, Tuple[bytes, float]] = {}
+        
+        if not os.path.exists(path):
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600))
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS credentials "
+            "(alias TEXT PRIMARY KEY, payload BLOB NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.aead = AESGCM(self._load_key(api_key))
+    
+    def _load_key(self, api_key: str) -> bytes:
+        rows = dict(self.connection.execute("SELECT name, value FROM meta"))
+        salt = rows.get("salt")
+        if salt is not None:
+            key = self._derive(api_key, salt)
+            if hmac.compare_digest(rows.get("key_id", b""), self._key_id(key)):
+                return key
+        
+        # 처음 만들었거나 다른 API 키로 봉인된 스냅샷이면 비우고 새로 시작한다
+        salt = os.urandom(16)
+        key = self._derive(api_key, salt)
+        with self.connection:
+            self.connection.execute("DELETE FROM credentials")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                [("salt", salt), ("key_id", self._key_id(key))]
+            )
+        return key
+    
+    def _derive(self, api_key: str, salt: bytes) -> bytes:
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=salt,
+            info=b'auth_tool client snapshot',
+        ).derive(api_key.encode())
+    
+    def _key_id(self, key: bytes) -> bytes:
+        return hmac.new(key, b'snapshot key id', hashlib.sha256).digest()
+    
+    def load(self, alias: str, max_age: Optional[float] = None) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT payload, fetched_at FROM credentials WHERE alias = ?", (alias,)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        
+        payload = row[0]
+        try:
+            # alias를 AAD로 묶어 다른 행의 암호문을 바꿔 끼우면 복호화에 실패한다
+            plaintext = self.aead.decrypt(payload[:NONCE_SIZE], payload[NONCE_SIZE:], alias.encode())
+        except Exception:
+            return None
+        return json.loads(plaintext)
+    
+    def save(self, alias: str, account_data: Dict[str, str]):
+        plaintext = json.dumps(account_data, sort_keys=True).encode()
+        digest = hashlib.sha256(plaintext).digest()
+        now = time.time()
+        written = self._written.get(alias)
+        if written is not None and written[0] == digest:
+            if now - written[1] >= TOUCH_INTERVAL:
+                with self._lock:
+                    self.connection.execute(
+                        "UPDATE credentials SET fetched_at = ? WHERE alias = ?", (now, alias)
+                    )
+                    self._written[alias] = (digest, now)
+            return
+        
+        nonce = os.urandom(NONCE_SIZE)
+        payload = nonce + self.aead.encrypt(nonce, plaintext, alias.encode())
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO credentials (alias, payload, fetched_at) VALUES (?, ?, ?)",
+                (alias, payload, now)
+            )
+            self._written[alias] = (digest, now)
+    
+    def remove(self, alias: str):
+        with self._lock:
+            self.connection.execute("DELETE FROM credentials WHERE alias = ?", (alias,))
+            self._written.pop(alias, None)
+    
+    def clear(self):
+        with self._lock:
+            self.connection.execute("DELETE FROM credentials")
+            self._written.clear()
+    
+    def close(self):
+        with self._lock:
+            self.connection.close()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AccountCreate(BaseModel):
@@ -16,6 +16,30 @@ class AccountResponse(BaseModel):
     username: str
     password: str
 
+class AccountBatchRequest(BaseModel):
+    aliases: List[str]
+
+class AccountBatchResponse(BaseModel):
+    accounts: List[AccountResponse]
+    missing: List[str]
+
+class AccountBulkRequest(BaseModel):
+    accounts: List[AccountCreate]
+    upsert: bool = False
+
+class AccountBulkResult(BaseModel):
+    alias: str
+    status: str
+    detail: Optional[str] = None
+
+class AccountBulkResponse(BaseModel):
+    results: List[AccountBulkResult]
+    created: int
+    updated: int
+    failed: int
+    elapsed_seconds: float
+    rows_per_second: float
+
 class AccountInfo(BaseModel):
     id: int
     alias: str
@@ -29,10 +53,27 @@ class ApiKeyCreate(BaseModel):
     key_name: str
 
 class ApiKeyResponse(BaseModel):
+    id: int
     key_name: str
-    api_key: str
+    key_prefix: Optional[str] = None
+    api_key: Optional[str] = None
     is_active: bool
     created_at: datetime
+    last_used: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ChangeEntry(BaseModel):
+    id: int
+    resource: str
+    key: str
+    action: str
+    changed_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeEntry]
+    cursor: int
\ No newline at end of file
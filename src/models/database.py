@@ -1,8 +1,13 @@
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import (
+    create_engine, event, inspect, text, and_, make_url, Column, Integer, String, Boolean, DateTime, Text
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from datetime import datetime
+from typing import Dict, Optional
 import os
+from config import config
 
 Base = declarative_base()
 
@@ -13,6 +18,11 @@ class Account(Base):
     alias = Column(String(50), unique=True, nullable=False)
     encrypted_username = Column(Text, nullable=False)
     encrypted_password = Column(Text, nullable=False)
+    # payload 모드에서는 모든 비밀 필드를 JSON으로 묶어 한 번에 암호화한다 (위 두 컬럼은 빈 문자열)
+    encrypted_payload = Column(Text, nullable=True)
+    # 계정별 데이터 키 (마스터 키 key_version으로 래핑됨). NULL이면 마스터 키로 직접 암호화된 이전 형식
+    encrypted_data_key = Column(Text, nullable=True)
+    key_version = Column(Integer, index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -21,23 +31,119 @@ class ApiKey(Base):
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     key_name = Column(String(50), unique=True, nullable=False)
-    api_key = Column(String(64), unique=True, nullable=False)
+    # 평문 키 대신 HMAC-SHA256 다이제스트를 저장한다 (기존 스키마 호환을 위해 컬럼명은 api_key 유지)
+    key_hash = Column("api_key", String(64), unique=True, nullable=False)
+    key_prefix = Column(String(16), index=True, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_used = Column(DateTime, nullable=True)
 
+class ChangeLog(Base):
+    __tablename__ = 'change_log'
+    # id가 변경 피드 커서이므로 SQLite에서도 삭제된 id를 재사용하지 않게 한다
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resource = Column(String(20), nullable=False)
+    key = Column(String(50), nullable=False)
+    action = Column(String(20), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+# 접두사 검색은 DB 기본 collation과 관계없이 코드 포인트(바이트) 순서로 비교해야 결과가 정확하다.
+# SQLite의 기본 collation(BINARY)은 이미 바이트 순서다
+BINARY_COLLATIONS = {"postgresql": "C", "mysql": "utf8mb4_bin", "mariadb": "utf8mb4_bin"}
+MAX_CODEPOINT = chr(0x10FFFF)
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    # prefix로 시작하는 모든 문자열보다 큰 가장 작은 문자열. 끝의 U+10FFFF는 올릴 수 없으므로 떼어 내고,
+    # 전부 U+10FFFF라면 상한이 없다
+    stem = prefix.rstrip(MAX_CODEPOINT)
+    if not stem:
+        return None
+    codepoint = ord(stem[-1]) + 1
+    if 0xD800 <= codepoint <= 0xDFFF:
+        codepoint = 0xE000
+    return stem[:-1] + chr(codepoint)
+
+def prefix_filter(column, prefix: str, backend_name: str = "sqlite"):
+    # 이스케이프한 LIKE 'prefix%'로 거르고, 같은 조건을 범위로도 걸어 unique 인덱스를 탈 수 있게 한다.
+    # SQLite의 LIKE는 ASCII 대소문자를 구분하지 않지만 바이너리 범위 조건이 그런 행을 걸러 낸다
+    collation = BINARY_COLLATIONS.get(backend_name)
+    if collation:
+        column = column.collate(collation)
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    conditions = [column >= prefix, column.like(f"{escaped}%", escape="\\")]
+    upper = prefix_upper_bound(prefix)
+    if upper is not None:
+        conditions.append(column < upper)
+    return and_(*conditions)
+
 class DatabaseManager:
-    def __init__(self, db_path: str = "auth_tool.db"):
-        self.db_path = db_path
-        self.engine = create_engine(f'sqlite:///{db_path}')
+    def __init__(self, db_path: Optional[str] = None, database_url: Optional[str] = None,
+                 pragmas: Optional[Dict[str, str]] = None, pool_size: Optional[int] = None,
+                 max_overflow: Optional[int] = None, pool_timeout: Optional[float] = None,
+                 poolclass: Optional[type] = None):
+        if db_path:
+            database_url = f'sqlite:///{db_path}'
+        self.database_url = make_url(database_url or config.DATABASE_URL)
+        self.backend_name = self.database_url.get_backend_name()
+        self.is_sqlite = self.backend_name == "sqlite"
+        self.db_path = self.database_url.database if self.is_sqlite else None
+        self.pragmas = config.SQLITE_PRAGMAS if pragmas is None else pragmas
+        
+        if self.is_sqlite and self.db_path in (None, "", ":memory:"):
+            # 메모리 DB는 연결 하나를 모든 스레드가 공유해야 같은 데이터를 본다
+            engine_options = {
+                "poolclass": StaticPool,
+                "connect_args": {"check_same_thread": False},
+            }
+        else:
+            engine_options = {
+                "pool_size": config.DB_POOL_SIZE if pool_size is None else pool_size,
+                "max_overflow": config.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+                "pool_timeout": config.DB_POOL_TIMEOUT if pool_timeout is None else pool_timeout,
+                "pool_recycle": config.DB_POOL_RECYCLE,
+                "pool_pre_ping": config.DB_POOL_PRE_PING,
+            }
+            if poolclass is not None:
+                engine_options["poolclass"] = poolclass
+        self.engine = create_engine(self.database_url, **engine_options)
+        if self.is_sqlite:
+            event.listen(self.engine, "connect", self._apply_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
         self.init_db()
     
+    def _apply_pragmas(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.pragmas.items():
+                if value:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
     def init_db(self):
         Base.metadata.create_all(bind=self.engine)
+        self._add_missing_columns()
+    
+    def _add_missing_columns(self):
+        # create_all은 기존 테이블을 변경하지 않으므로 새로 추가된 컬럼과 인덱스를 보충한다
+        inspector = inspect(self.engine)
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                existing = {column["name"] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        column_type = column.type.compile(dialect=self.engine.dialect)
+                        connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                for index in table.indexes:
+                    index.create(bind=connection, checkfirst=True)
     
     def get_session(self):
         return self.SessionLocal()
     
     def close_session(self, session):
-        session.close()
\ No newline at end of file
+        session.close()
+    
+    def dispose(self):
+        self.engine.dispose()
\ No newline at end of file
@@ -1,13 +1,185 @@
+import json
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from ..models.database import Account, DatabaseManager
-from ..models.account import AccountCreate, AccountUpdate, AccountResponse, AccountInfo
-from .encryption import EncryptionService
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.database import Account, DatabaseManager, prefix_filter
+from ..models.account import (
+    AccountCreate, AccountUpdate, AccountResponse, AccountInfo, AccountBatchResponse,
+    AccountBulkResult, AccountBulkResponse
+)
+from .cache import TTLCache
+from .changes import ACCOUNT, CREATED, DELETED, UPDATED, record_change
+from .encryption import EncryptionService, is_current_format
+
+def _import_error_detail(error: Exception) -> str:
+    # DB 예외 메시지에는 SQL 문과 바인딩 값(암호문)이 들어 있으므로 결과에는 짧은 설명만 남긴다
+    if isinstance(error, IntegrityError):
+        return "Constraint violation (the alias may have been created concurrently)"
+    return f"Database error ({type(error).__name__})"
+
+class CachedCredential:
+    # version은 평문을 읽어 온 행의 (id, updated_at)이다
+    def __init__(self, username: str, password: str, version: Optional[Tuple[int, datetime]] = None):
+        self._username = bytearray(username.encode())
+        self._password = bytearray(password.encode())
+        self.version = version
+        self._lock = threading.Lock()
+        self._wiped = False
+    
+    def read(self) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            if self._wiped:
+                return None
+            return self._username.decode(), self._password.decode()
+    
+    def wipe(self):
+        # 캐시에서 빠질 때 평문 버퍼를 0으로 덮어쓴다
+        with self._lock:
+            for buffer in (self._username, self._password):
+                buffer[:] = bytes(len(buffer))
+            self._wiped = True
+    
+    def nbytes(self) -> int:
+        return len(self._username) + len(self._password)
 
 class AccountManager:
-    def __init__(self, db_manager: DatabaseManager, encryption_service: EncryptionService):
+    def __init__(self, db_manager: DatabaseManager, encryption_service: EncryptionService,
+                 cache_size: int = 0, cache_ttl: float = 30.0, lazy_upgrade: bool = True,
+                 payload_mode: bool = False):
         self.db_manager = db_manager
         self.encryption_service = encryption_service
+        self.lazy_upgrade = lazy_upgrade
+        self.payload_mode = payload_mode
+        self.account_cache = TTLCache(
+            max_size=cache_size,
+            ttl=cache_ttl,
+            on_evict=CachedCredential.wipe,
+            sizeof=CachedCredential.nbytes
+        )
+        # 수정/삭제로 무효화될 때마다 올라간다. 읽는 도중 무효화가 있었으면 읽은 값을 캐시에 넣지 않는다
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+    
+    def seal_credentials(self, username: str, password: str) -> Dict:
+        # 계정마다 새 데이터 키를 만들고, 데이터 키는 현재 활성 마스터 키로 래핑한다
+        data_key, wrapped_key, version = self.encryption_service.generate_data_key()
+        encrypt = lambda value: self.encryption_service.encrypt_with_data_key(data_key, value)
+        if self.payload_mode:
+            # 모든 비밀 필드를 하나의 암호문으로 묶는다 (개별 컬럼은 빈 값)
+            payload = json.dumps({"username": username, "password": password}, separators=(",", ":"))
+            sealed = {"encrypted_username": "", "encrypted_password": "", "encrypted_payload": encrypt(payload)}
+        else:
+            sealed = {
+                "encrypted_username": encrypt(username),
+                "encrypted_password": encrypt(password),
+                "encrypted_payload": None,
+            }
+        sealed.update(encrypted_data_key=wrapped_key, key_version=version)
+        return sealed
+    
+    def unseal_credentials(self, db_account) -> Tuple[str, str]:
+        if db_account.encrypted_data_key is None:
+            decrypt = self.encryption_service.decrypt
+        else:
+            data_key = self.encryption_service.unwrap_data_key(db_account.encrypted_data_key, db_account.key_version)
+            decrypt = lambda value: self.encryption_service.decrypt_with_data_key(data_key, value)
+        if db_account.encrypted_payload is not None:
+            payload = json.loads(decrypt(db_account.encrypted_payload))
+            return payload["username"], payload["password"]
+        return decrypt(db_account.encrypted_username), decrypt(db_account.encrypted_password)
+    
+    def needs_upgrade(self, db_account) -> bool:
+        if db_account.encrypted_data_key is None:
+            return True
+        if self.payload_mode != (db_account.encrypted_payload is not None):
+            return True
+        if db_account.encrypted_payload is not None:
+            return not is_current_format(db_account.encrypted_payload)
+        return not is_current_format(db_account.encrypted_username)
+    
+    def _reseal(self, session: Session, db_account, username: str, password: str):
+        # 처리 중에 계정이 수정됐다면 덮어쓰지 않는다. 내용 변경이 아니므로 updated_at은 유지한다
+        table = Account.__table__
+        session.execute(
+            update(table)
+            .where(
+                table.c.id == db_account.id,
+                table.c.encrypted_username == db_account.encrypted_username,
+                table.c.encrypted_payload.is_not_distinct_from(db_account.encrypted_payload)
+            )
+            .values(updated_at=table.c.updated_at, **self.seal_credentials(username, password))
+        )
+    
+    def _upgrade_if_needed(self, session: Session, db_account, username: str, password: str) -> bool:
+        # 이전 형식으로 저장된 계정은 읽는 시점에 현재 형식으로 다시 암호화한다
+        if not self.lazy_upgrade or not self.needs_upgrade(db_account):
+            return False
+        self._reseal(session, db_account, username, password)
+        return True
+    
+    def reencrypt_outdated(self, chunk_size: int = 500) -> int:
+        upgraded = 0
+        last_id = 0
+        while True:
+            session = self.db_manager.get_session()
+            try:
+                db_accounts = session.query(Account).filter(
+                    Account.id > last_id
+                ).order_by(Account.id).limit(chunk_size).all()
+                if not db_accounts:
+                    return upgraded
+                outdated = [db_account for db_account in db_accounts if self.needs_upgrade(db_account)]
+                credentials = self.encryption_service.run_batch(self.unseal_credentials, outdated)
+                for db_account, (username, password) in zip(outdated, credentials):
+                    self._reseal(session, db_account, username, password)
+                upgraded += len(outdated)
+                # 커밋하면 행이 만료되므로 커서는 커밋 전에 읽어 둔다
+                last_id = db_accounts[-1].id
+                session.commit()
+            finally:
+                self.db_manager.close_session(session)
+    
+    def migrate_from(self, source: "AccountManager", chunk_size: int = 500) -> int:
+        # source의 키로 열리는 계정을 이 관리자의 키로 다시 암호화한다.
+        # 이미 옮긴 계정은 건너뛰므로 중간에 멈췄다면 다시 실행하면 된다
+        def unseal(db_account) -> Optional[Tuple[str, str]]:
+            try:
+                return source.unseal_credentials(db_account)
+            except Exception:
+                self.unseal_credentials(db_account)
+                return None
+        
+        migrated = 0
+        last_id = 0
+        while True:
+            session = self.db_manager.get_session()
+            try:
+                db_accounts = session.query(Account).filter(
+                    Account.id > last_id
+                ).order_by(Account.id).limit(chunk_size).all()
+                if not db_accounts:
+                    return migrated
+                credentials = self.encryption_service.run_batch(unseal, db_accounts)
+                for db_account, unsealed in zip(db_accounts, credentials):
+                    if unsealed is not None:
+                        self._reseal(session, db_account, *unsealed)
+                        migrated += 1
+                last_id = db_accounts[-1].id
+                session.commit()
+            finally:
+                self.db_manager.close_session(session)
+    
+    def _commit_upgrades(self, session: Session):
+        # 재암호화 실패는 조회 결과에 영향을 주지 않는다 (다음 조회 때 다시 시도)
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
     
     def create_account(self, account_data: AccountCreate) -> AccountInfo:
         session = self.db_manager.get_session()
@@ -16,16 +188,13 @@ class AccountManager:
             if existing_account:
                 raise ValueError(f"Account with alias '{account_data.alias}' already exists")
             
-            encrypted_username = self.encryption_service.encrypt(account_data.username)
-            encrypted_password = self.encryption_service.encrypt(account_data.password)
-            
             db_account = Account(
                 alias=account_data.alias,
-                encrypted_username=encrypted_username,
-                encrypted_password=encrypted_password
+                **self.seal_credentials(account_data.username, account_data.password)
             )
             
             session.add(db_account)
+            record_change(session, ACCOUNT, account_data.alias, CREATED)
             session.commit()
             session.refresh(db_account)
             
@@ -33,24 +202,190 @@ class AccountManager:
         finally:
             self.db_manager.close_session(session)
     
+    def import_accounts(self, accounts: Iterable[AccountCreate], upsert: bool = False,
+                        chunk_size: int = 500) -> AccountBulkResponse:
+        started = time.perf_counter()
+        results: List[AccountBulkResult] = []
+        seen = set()
+        
+        iterator = iter(accounts)
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            rows = []
+            for account_data in chunk:
+                if account_data.alias in seen:
+                    results.append(AccountBulkResult(
+                        alias=account_data.alias, status="error", detail="Duplicate alias in input"
+                    ))
+                else:
+                    seen.add(account_data.alias)
+                    rows.append(account_data)
+            if rows:
+                results.extend(self._import_chunk(rows, upsert))
+        
+        elapsed = time.perf_counter() - started
+        return AccountBulkResponse(
+            results=results,
+            created=sum(1 for result in results if result.status == "created"),
+            updated=sum(1 for result in results if result.status == "updated"),
+            failed=sum(1 for result in results if result.status == "error"),
+            elapsed_seconds=elapsed,
+            rows_per_second=len(results) / elapsed if elapsed > 0 else 0.0
+        )
+    
+    def _import_chunk(self, rows: List[AccountCreate], upsert: bool,
+                      sealed_rows: Optional[List[Dict]] = None) -> List[AccountBulkResult]:
+        if sealed_rows is None:
+            sealed_rows = self.encryption_service.run_batch(
+                lambda row: self.seal_credentials(row.username, row.password), rows
+            )
+        
+        failure = None
+        session = self.db_manager.get_session()
+        try:
+            existing = {
+                account.alias: account
+                for account in session.query(Account).filter(Account.alias.in_([row.alias for row in rows]))
+            }
+            
+            results = []
+            for row, sealed in zip(rows, sealed_rows):
+                db_account = existing.get(row.alias)
+                if db_account is None:
+                    session.add(Account(alias=row.alias, **sealed))
+                    record_change(session, ACCOUNT, row.alias, CREATED)
+                    results.append(AccountBulkResult(alias=row.alias, status="created"))
+                elif upsert:
+                    for column, value in sealed.items():
+                        setattr(db_account, column, value)
+                    record_change(session, ACCOUNT, row.alias, UPDATED)
+                    results.append(AccountBulkResult(alias=row.alias, status="updated"))
+                else:
+                    results.append(AccountBulkResult(
+                        alias=row.alias, status="error", detail="Account already exists"
+                    ))
+            
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            failure = e
+        finally:
+            self.db_manager.close_session(session)
+        
+        if failure is not None:
+            if len(rows) == 1:
+                return [AccountBulkResult(alias=rows[0].alias, status="error", detail=_import_error_detail(failure))]
+            # 한 행 때문에 묶음 전체가 롤백됐을 수 있으므로 한 행씩 다시 넣어 실패한 행만 표시한다
+            return [
+                result
+                for row, sealed in zip(rows, sealed_rows)
+                for result in self._import_chunk([row], upsert, [sealed])
+            ]
+        
+        for alias in existing:
+            self._invalidate(alias)
+        return results
+    
+    def _fill_cache(self, generation: int, alias: str, username: str, password: str,
+                    version: Tuple[int, datetime]):
+        with self._generation_lock:
+            if self._generation == generation:
+                self.account_cache.set(alias, CachedCredential(username, password, version))
+    
+    def _invalidate(self, alias: str):
+        with self._generation_lock:
+            self._generation += 1
+            self.account_cache.invalidate(alias)
+    
+    def _cached_account(self, alias: str, version: Optional[Tuple[int, datetime]]) -> Optional[AccountResponse]:
+        # 다른 워커나 UI가 수정했을 수 있으므로 캐시 항목은 DB의 현재 버전과 같을 때만 쓴다
+        cached = self.account_cache.get(alias)
+        credentials = cached.read() if cached and cached.version == version else None
+        if credentials:
+            return AccountResponse(alias=alias, username=credentials[0], password=credentials[1])
+        return None
+    
     def get_account(self, alias: str) -> Optional[AccountResponse]:
+        result = self.get_account_with_version(alias)
+        return result[0] if result else None
+    
+    def get_account_with_version(self, alias: str, version: Optional[Tuple[int, datetime]] = None
+                                 ) -> Optional[Tuple[AccountResponse, Tuple[int, datetime]]]:
+        # 반환하는 버전은 본문을 만든 행의 버전이다 (ETag와 본문이 어긋나지 않도록)
+        if self.account_cache.max_size > 0:
+            if version is None:
+                version = self.get_account_version(alias)
+                if version is None:
+                    return None
+            account = self._cached_account(alias, version)
+            if account:
+                return account, version
+        
+        generation = self._generation
         session = self.db_manager.get_session()
         try:
             db_account = session.query(Account).filter(Account.alias == alias).first()
             if not db_account:
                 return None
             
-            username = self.encryption_service.decrypt(db_account.encrypted_username)
-            password = self.encryption_service.decrypt(db_account.encrypted_password)
+            row_version = (db_account.id, db_account.updated_at)
+            username, password = self.unseal_credentials(db_account)
+            if self._upgrade_if_needed(session, db_account, username, password):
+                self._commit_upgrades(session)
+            self._fill_cache(generation, alias, username, password, row_version)
             
-            return AccountResponse(
-                alias=db_account.alias,
-                username=username,
-                password=password
-            )
+            return AccountResponse(alias=alias, username=username, password=password), row_version
         finally:
             self.db_manager.close_session(session)
     
+    def _get_versions(self, aliases: List[str]) -> Dict[str, Tuple[int, datetime]]:
+        session = self.db_manager.get_session()
+        try:
+            rows = session.query(Account.alias, Account.id, Account.updated_at).filter(Account.alias.in_(aliases))
+            return {alias: (account_id, updated_at) for alias, account_id, updated_at in rows}
+        finally:
+            self.db_manager.close_session(session)
+    
+    def get_accounts(self, aliases: List[str]) -> AccountBatchResponse:
+        requested = list(dict.fromkeys(aliases))
+        found = {}
+        
+        if self.account_cache.max_size > 0 and requested:
+            for alias, version in self._get_versions(requested).items():
+                account = self._cached_account(alias, version)
+                if account:
+                    found[alias] = account
+        
+        pending = [alias for alias in requested if alias not in found]
+        if pending:
+            generation = self._generation
+            session = self.db_manager.get_session()
+            try:
+                db_accounts = session.query(Account).filter(Account.alias.in_(pending)).all()
+                versions = [(db_account.id, db_account.updated_at) for db_account in db_accounts]
+                credentials = self.encryption_service.run_batch(self.unseal_credentials, db_accounts)
+                upgraded = False
+                for db_account, version, (username, password) in zip(db_accounts, versions, credentials):
+                    upgraded |= self._upgrade_if_needed(session, db_account, username, password)
+                    self._fill_cache(generation, db_account.alias, username, password, version)
+                    found[db_account.alias] = AccountResponse(
+                        alias=db_account.alias,
+                        username=username,
+                        password=password
+                    )
+                if upgraded:
+                    self._commit_upgrades(session)
+            finally:
+                self.db_manager.close_session(session)
+        
+        return AccountBatchResponse(
+            accounts=[found[alias] for alias in requested if alias in found],
+            missing=[alias for alias in requested if alias not in found]
+        )
+    
     def update_account(self, alias: str, account_data: AccountUpdate) -> Optional[AccountInfo]:
         session = self.db_manager.get_session()
         try:
@@ -58,13 +393,14 @@ class AccountManager:
             if not db_account:
                 return None
             
-            if account_data.username:
-                db_account.encrypted_username = self.encryption_service.encrypt(account_data.username)
-            
-            if account_data.password:
-                db_account.encrypted_password = self.encryption_service.encrypt(account_data.password)
+            username, password = self.unseal_credentials(db_account)
+            sealed = self.seal_credentials(account_data.username or username, account_data.password or password)
+            for column, value in sealed.items():
+                setattr(db_account, column, value)
+            record_change(session, ACCOUNT, alias, UPDATED)
             
             session.commit()
+            self._invalidate(alias)
             session.refresh(db_account)
             
             return AccountInfo.from_orm(db_account)
@@ -79,15 +415,44 @@ class AccountManager:
                 return False
             
             session.delete(db_account)
+            record_change(session, ACCOUNT, alias, DELETED)
             session.commit()
+            self._invalidate(alias)
             return True
         finally:
             self.db_manager.close_session(session)
     
-    def list_accounts(self) -> List[AccountInfo]:
+    def get_account_version(self, alias: str) -> Optional[Tuple[int, datetime]]:
+        # 복호화 없이 ETag를 계산할 수 있도록 id와 updated_at만 조회한다
+        session = self.db_manager.get_session()
+        try:
+            row = session.query(Account.id, Account.updated_at).filter(Account.alias == alias).first()
+            return tuple(row) if row else None
+        finally:
+            self.db_manager.close_session(session)
+    
+    def get_collection_version(self, prefix: Optional[str] = None) -> Tuple[Optional[datetime], int]:
+        session = self.db_manager.get_session()
+        try:
+            query = session.query(func.max(Account.updated_at), func.count(Account.id))
+            if prefix:
+                query = query.filter(prefix_filter(Account.alias, prefix, self.db_manager.backend_name))
+            return tuple(query.one())
+        finally:
+            self.db_manager.close_session(session)
+    
+    def list_accounts(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                      prefix: Optional[str] = None) -> List[AccountInfo]:
         session = self.db_manager.get_session()
         try:
-            db_accounts = session.query(Account).all()
-            return [AccountInfo.from_orm(account) for account in db_accounts]
+            query = session.query(Account.id, Account.alias, Account.created_at, Account.updated_at)
+            if after_id is not None:
+                query = query.filter(Account.id > after_id)
+            if prefix:
+                query = query.filter(prefix_filter(Account.alias, prefix, self.db_manager.backend_name))
+            query = query.order_by(Account.id)
+            if limit is not None:
+                query = query.limit(limit)
+            return [AccountInfo.from_orm(row) for row in query]
         finally:
             self.db_manager.close_session(session)
\ No newline at end of file
@@ -1,14 +1,124 @@
+import hashlib
+import hmac
+import os
 import secrets
 import string
-from datetime import datetime
-from typing import Optional
+import threading
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
-from ..models.database import ApiKey, DatabaseManager
+from config import config
+from ..models.database import ApiKey, DatabaseManager, prefix_filter
 from ..models.account import ApiKeyCreate, ApiKeyResponse
+from .cache import TTLCache
+from .kdf_cache import file_lock, write_private_file
+from .changes import (
+    ACTIVATED, API_KEY, CREATED, DEACTIVATED, DELETED, ChangeFeed, ChangeFeedExpired, record_change
+)
+from .usage import LastUsedBuffer
+
+KEY_PREFIX_LENGTH = 8
+
+class RevocationWatcher:
+    # 다른 프로세스(Tk UI, 다른 워커)에서 비활성화/삭제한 키는 이 프로세스의 검증 캐시에 TTL 동안 남으므로
+    # change_log를 따라가다가 그런 변경이 보이면 캐시를 비운다.
+    # 캐시 키는 HMAC 해시라 삭제된 키 이름으로는 항목을 찾을 수 없어 전체를 비운다 (드문 일이라 비용은 작다)
+    def __init__(self, change_feed: ChangeFeed, clear_cache: Callable[[], None], poll_interval: float = 2.0):
+        self.change_feed = change_feed
+        self.clear_cache = clear_cache
+        self.poll_interval = poll_interval
+        self.cursor: Optional[int] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def poll(self) -> bool:
+        if self.cursor is None:
+            self.cursor = self.change_feed.head()
+            return False
+        revoked = False
+        try:
+            while True:
+                changes, cursor = self.change_feed.list_changes(self.cursor, resource=API_KEY)
+                revoked = revoked or any(change.action in (DEACTIVATED, DELETED) for change in changes)
+                if cursor == self.cursor:
+                    break
+                self.cursor = cursor
+        except ChangeFeedExpired:
+            # 놓친 구간을 알 수 없으므로 폐기된 키가 있었다고 본다
+            self.cursor = self.change_feed.head()
+            revoked = True
+        if revoked:
+            self.clear_cache()
+        return revoked
+    
+    def start(self):
+        if self.poll_interval <= 0 or self._thread is not None:
+            return
+        self.poll()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="api-key-revocations", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:
+                pass
 
 class AuthService:
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, cache_size: int = 1024, cache_ttl: float = 60.0,
+                 last_used_flush_interval: float = 0, secret: Optional[bytes] = None,
+                 revocation_poll_interval: float = 0):
         self.db_manager = db_manager
+        self.secret = secret or self._get_or_create_secret()
+        self.key_cache = TTLCache(max_size=cache_size, ttl=cache_ttl)
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+        self.last_used = LastUsedBuffer(db_manager, flush_interval=last_used_flush_interval)
+        self.revocations = RevocationWatcher(
+            ChangeFeed(db_manager, lag=config.CHANGE_FEED_LAG), self._clear_cache, poll_interval=revocation_poll_interval
+        )
+        self.migrate_legacy_keys()
+    
+    def _get_or_create_secret(self) -> bytes:
+        if config.API_KEY_SECRET:
+            return config.API_KEY_SECRET.encode()
+        secret_file = config.API_KEY_SECRET_FILE
+        if os.path.exists(secret_file):
+            with open(secret_file, 'rb') as f:
+                return f.read()
+        # 동시에 기동한 워커들이 서로 다른 시크릿을 만들지 않도록 잠금 안에서 다시 확인한 뒤 만든다
+        with file_lock(f"{secret_file}.lock"):
+            if os.path.exists(secret_file):
+                with open(secret_file, 'rb') as f:
+                    return f.read()
+            secret = secrets.token_bytes(32)
+            write_private_file(secret_file, secret)
+            return secret
+    
+    def hash_api_key(self, api_key: str) -> str:
+        return hmac.new(self.secret, api_key.encode(), hashlib.sha256).hexdigest()
+    
+    def migrate_legacy_keys(self) -> int:
+        # key_prefix가 없는 행은 api_key 컬럼에 평문 키가 남아 있는 이전 버전 데이터다
+        session = self.db_manager.get_session()
+        try:
+            legacy_keys = session.query(ApiKey).filter(ApiKey.key_prefix == None).all()
+            for db_api_key in legacy_keys:
+                raw_key = db_api_key.key_hash
+                db_api_key.key_prefix = raw_key[:KEY_PREFIX_LENGTH]
+                db_api_key.key_hash = self.hash_api_key(raw_key)
+            if legacy_keys:
+                session.commit()
+            return len(legacy_keys)
+        finally:
+            self.db_manager.close_session(session)
     
     def generate_api_key(self) -> str:
         alphabet = string.ascii_letters + string.digits
@@ -25,41 +135,72 @@ class AuthService:
             
             db_api_key = ApiKey(
                 key_name=key_data.key_name,
-                api_key=api_key,
+                key_prefix=api_key[:KEY_PREFIX_LENGTH],
+                key_hash=self.hash_api_key(api_key),
                 is_active=True
             )
             
             session.add(db_api_key)
+            record_change(session, API_KEY, key_data.key_name, CREATED)
             session.commit()
             session.refresh(db_api_key)
             
-            return ApiKeyResponse.from_orm(db_api_key)
+            # 평문 키는 생성 응답에서 한 번만 반환된다
+            response = ApiKeyResponse.from_orm(db_api_key)
+            response.api_key = api_key
+            return response
         finally:
             self.db_manager.close_session(session)
     
     def validate_api_key(self, api_key: str) -> bool:
-        session = self.db_manager.get_session()
-        try:
-            db_api_key = session.query(ApiKey).filter(
-                ApiKey.api_key == api_key,
-                ApiKey.is_active == True
-            ).first()
+        key_hash = self.hash_api_key(api_key)
+        key_id = self.key_cache.get(key_hash)
+        if key_id is None:
+            generation = self._generation
+            session = self.db_manager.get_session()
+            try:
+                candidates = session.query(ApiKey.id, ApiKey.key_hash).filter(
+                    ApiKey.key_prefix == api_key[:KEY_PREFIX_LENGTH],
+                    ApiKey.is_active == True
+                ).all()
+            finally:
+                self.db_manager.close_session(session)
             
-            if db_api_key:
-                db_api_key.last_used = datetime.utcnow()
-                session.commit()
-                return True
-            return False
-        finally:
-            self.db_manager.close_session(session)
+            for candidate_id, candidate_hash in candidates:
+                if hmac.compare_digest(candidate_hash, key_hash):
+                    key_id = candidate_id
+            if key_id is None:
+                return False
+            self._fill_cache(generation, key_hash, key_id)
+        
+        self.last_used.record(key_id)
+        return True
+    
+    def _fill_cache(self, generation: int, key_hash: str, key_id: int):
+        # DB를 읽는 사이에 비활성화/삭제가 끼어들었다면 폐기된 키를 다시 캐시하지 않도록 건너뛴다
+        with self._generation_lock:
+            if self._generation == generation:
+                self.key_cache.set(key_hash, key_id)
+    
+    def _invalidate(self, key_hash: str):
+        with self._generation_lock:
+            self._generation += 1
+            self.key_cache.invalidate(key_hash)
+    
+    def _clear_cache(self):
+        with self._generation_lock:
+            self._generation += 1
+            self.key_cache.clear()
     
     def get_api_key_info(self, api_key: str) -> Optional[ApiKeyResponse]:
+        key_hash = self.hash_api_key(api_key)
         session = self.db_manager.get_session()
         try:
-            db_api_key = session.query(ApiKey).filter(ApiKey.api_key == api_key).first()
-            if not db_api_key:
-                return None
-            return ApiKeyResponse.from_orm(db_api_key)
+            candidates = session.query(ApiKey).filter(ApiKey.key_prefix == api_key[:KEY_PREFIX_LENGTH]).all()
+            for db_api_key in candidates:
+                if hmac.compare_digest(db_api_key.key_hash, key_hash):
+                    return ApiKeyResponse.from_orm(db_api_key)
+            return None
         finally:
             self.db_manager.close_session(session)
     
@@ -70,8 +211,11 @@ class AuthService:
             if not db_api_key:
                 return False
             
+            key_hash = db_api_key.key_hash
             db_api_key.is_active = False
+            record_change(session, API_KEY, key_name, DEACTIVATED)
             session.commit()
+            self._invalidate(key_hash)
             return True
         finally:
             self.db_manager.close_session(session)
@@ -83,8 +227,11 @@ class AuthService:
             if not db_api_key:
                 return False
             
+            key_hash = db_api_key.key_hash
             db_api_key.is_active = True
+            record_change(session, API_KEY, key_name, ACTIVATED)
             session.commit()
+            self._invalidate(key_hash)
             return True
         finally:
             self.db_manager.close_session(session)
@@ -96,16 +243,35 @@ class AuthService:
             if not db_api_key:
                 return False
             
+            key_hash, key_id = db_api_key.key_hash, db_api_key.id
             session.delete(db_api_key)
+            record_change(session, API_KEY, key_name, DELETED)
             session.commit()
+            self._invalidate(key_hash)
+            self.last_used.discard(key_id)
             return True
         finally:
             self.db_manager.close_session(session)
     
-    def list_api_keys(self) -> list[ApiKeyResponse]:
+    def list_api_keys(self, after_id: Optional[int] = None, limit: Optional[int] = None,
+                      prefix: Optional[str] = None) -> list[ApiKeyResponse]:
         session = self.db_manager.get_session()
         try:
-            db_api_keys = session.query(ApiKey).all()
-            return [ApiKeyResponse.from_orm(key) for key in db_api_keys]
+            query = session.query(ApiKey)
+            if after_id is not None:
+                query = query.filter(ApiKey.id > after_id)
+            if prefix:
+                query = query.filter(prefix_filter(ApiKey.key_name, prefix, self.db_manager.backend_name))
+            query = query.order_by(ApiKey.id)
+            if limit is not None:
+                query = query.limit(limit)
+            db_api_keys = query.all()
+            api_keys = [ApiKeyResponse.from_orm(key) for key in db_api_keys]
+            for api_key in api_keys:
+                # 버퍼에 남아 있는 최근 사용 시각이 DB 값보다 새롭다
+                pending = self.last_used.get(api_key.id)
+                if pending and (api_key.last_used is None or pending > api_key.last_used):
+                    api_key.last_used = pending
+            return api_keys
         finally:
             self.db_manager.close_session(session)
\ No newline at end of file
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+class TTLCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0,
+                 on_evict: Optional[Callable[[Any], None]] = None,
+                 sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._discard(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._discard(key)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            while len(self._data) > self.max_size:
+                self._discard(next(iter(self._data)))
+    
+    def invalidate(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._discard(key)
+            return True
+    
+    def clear(self):
+        with self._lock:
+            for key in list(self._data):
+                self._discard(key)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        stats = {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+        if self.sizeof:
+            with self._lock:
+                stats["memory_bytes"] = sum(self.sizeof(value) for value, _ in self._data.values())
+        return stats
+    
+    def _discard(self, key: Hashable):
+        entry = self._data.pop(key, None)
+        if entry is not None and self.on_evict:
+            self.on_evict(entry[0])
@@ -0,0 +1,118 @@
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ..models.database import ChangeLog, DatabaseManager
+from ..models.account import ChangeEntry
+
+ACCOUNT = "account"
+API_KEY = "api_key"
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+ACTIVATED = "activated"
+DEACTIVATED = "deactivated"
+# 정리된 구간의 마지막 행을 이 값으로 바꿔 남긴다. 이 id보다 앞선 커서는 이어서 읽을 수 없다
+PRUNED = "pruned"
+
+class ChangeFeedExpired(Exception):
+    def __init__(self, horizon: int):
+        super().__init__(f"Changes up to {horizon} have been pruned")
+        self.horizon = horizon
+
+def record_change(session: Session, resource: str, key: str, action: str):
+    # 변경과 같은 트랜잭션에 기록해야 커밋된 변경만 피드에 나타난다
+    session.add(ChangeLog(resource=resource, key=key, action=action))
+
+class ChangeFeed:
+    # id는 INSERT 시점에 할당되지만 커밋 순서는 다를 수 있다 (PostgreSQL 시퀀스 등).
+    # 커서는 빈 id 없이 이어진 구간까지만 전진하고, lag초보다 오래된 빈 id만 롤백된 것으로 보고 건너뛴다.
+    def __init__(self, db_manager: DatabaseManager, lag: float = 5.0, retention: float = 7 * 86400,
+                 prune_interval: float = 3600.0):
+        self.db_manager = db_manager
+        self.lag = lag
+        self.retention = retention
+        self.prune_interval = prune_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def head(self) -> int:
+        session = self.db_manager.get_session()
+        try:
+            return session.query(func.max(ChangeLog.id)).scalar() or 0
+        finally:
+            self.db_manager.close_session(session)
+    
+    def list_changes(self, since: int, limit: int = 1000,
+                     resource: Optional[str] = None) -> Tuple[List[ChangeEntry], int]:
+        # (변경 목록, 다음 커서). resource로 거른 항목이 없어도 커서는 읽은 구간만큼 전진한다
+        session = self.db_manager.get_session()
+        try:
+            oldest = session.query(ChangeLog.id, ChangeLog.action).order_by(ChangeLog.id).first()
+            if oldest is not None and oldest.action == PRUNED and since < oldest.id:
+                raise ChangeFeedExpired(oldest.id)
+            
+            rows = session.query(ChangeLog).filter(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit).all()
+            settled = datetime.utcnow() - timedelta(seconds=self.lag)
+            cursor = since
+            changes = []
+            for row in rows:
+                if row.id != cursor + 1 and row.changed_at > settled:
+                    break
+                cursor = row.id
+                if row.action != PRUNED and (not resource or row.resource == resource):
+                    changes.append(ChangeEntry.from_orm(row))
+            return changes, cursor
+        finally:
+            self.db_manager.close_session(session)
+    
+    def prune(self) -> int:
+        # 가장 최근 행은 남겨야 head()가 뒤로 가지 않는다
+        if self.retention <= 0:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        session = self.db_manager.get_session()
+        try:
+            newest = session.query(func.max(ChangeLog.id)).scalar()
+            if newest is None:
+                return 0
+            horizon = session.query(func.max(ChangeLog.id)).filter(
+                ChangeLog.id < newest,
+                ChangeLog.changed_at < cutoff
+            ).scalar()
+            if horizon is None:
+                return 0
+            
+            deleted = session.query(ChangeLog).filter(ChangeLog.id < horizon).delete(synchronize_session=False)
+            session.query(ChangeLog).filter(ChangeLog.id == horizon).update(
+                {"action": PRUNED, "key": ""}, synchronize_session=False
+            )
+            session.commit()
+            return deleted
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.db_manager.close_session(session)
+    
+    def start(self):
+        if self.retention <= 0 or self.prune_interval <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="change-log-pruner", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop_event.wait(self.prune_interval):
+            try:
+                self.prune()
+            except Exception:
+                pass
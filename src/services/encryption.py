@@ -1,30 +1,106 @@
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
+import hashlib
+import json
 import os
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from config import config
+from .kdf_cache import SealedKeyCache, file_lock, write_private_file
+from .metrics import crypto_duration, timed
+
+# encryption.key (또는 MASTER_KEY 파생 키)는 항상 마스터 키 버전 1이다
+LEGACY_KEY_VERSION = 1
+
+# v2 암호문: "v2:" + base64url(nonce 12바이트 + AES-256-GCM 암호문/태그)
+# 접두사가 없으면 Fernet 토큰(데이터 키 방식) 또는 Fernet 토큰을 한 번 더 base64 인코딩한 이전 형식이다
+CIPHERTEXT_PREFIX = "v2:"
+NONCE_SIZE = 12
+
+# 이보다 작은 배치는 스레드 전환 비용이 더 크므로 호출 스레드에서 처리한다
+PARALLEL_BATCH_THRESHOLD = 64
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 프로세스 내 PBKDF2 결과 캐시 (키: 마스터 키와 salt의 SHA-256 다이제스트)
+_derived_keys: Dict[str, bytes] = {}
+_derived_keys_lock = threading.Lock()
+
+def is_current_format(encrypted_text: str) -> bool:
+    return encrypted_text.startswith(CIPHERTEXT_PREFIX)
 
 class EncryptionService:
-    def __init__(self, master_key: Optional[str] = None):
+    # master_key를 생략하면 MASTER_KEY 설정을 쓰고, 빈 문자열이면 키 파일을 쓴다
+    def __init__(self, master_key: Optional[str] = None, kdf_cache_file: Optional[str] = None,
+                 keyring_file: Optional[str] = None, workers: Optional[int] = None,
+                 key_file: Optional[str] = None):
+        self.kdf_cache_file = kdf_cache_file or config.KDF_CACHE_FILE
+        self.key_file = key_file or config.ENCRYPTION_KEY_FILE
+        self.workers = config.CRYPTO_WORKERS if workers is None else workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        if master_key is None:
+            master_key = config.MASTER_KEY
         if master_key:
+            if os.path.exists(self.key_file):
+                # 키 파일로 암호화된 기존 계정을 열 수 없게 되므로 옮기기 전에는 시작하지 않는다
+                raise RuntimeError(
+                    f"MASTER_KEY is set but {self.key_file} still exists. "
+                    "Run 'python migrate_accounts.py --to-master-key' to re-encrypt existing accounts, "
+                    "or unset MASTER_KEY."
+                )
             self.key = self._derive_key(master_key.encode())
         else:
             self.key = self._get_or_create_key()
         self.cipher_suite = Fernet(self.key)
-    
-    def _derive_key(self, password: bytes, salt: bytes = b'stable_salt_for_auth_tool') -> bytes:
-        kdf = PBKDF2HMAC(
+        self.aead = AESGCM(HKDF(
             algorithm=hashes.SHA256(),
             length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+            salt=None,
+            info=b'auth_tool field encryption',
+        ).derive(base64.urlsafe_b64decode(self.key)))
+        
+        self.keyring_file = keyring_file or config.KEYRING_FILE
+        self.master_keys: Dict[int, Fernet] = {LEGACY_KEY_VERSION: self.cipher_suite}
+        self.rotated_keys: Dict[int, bytes] = {}
+        self.active_version = LEGACY_KEY_VERSION
+        self._keyring_mtime: Optional[float] = None
+        self._keyring_lock = threading.Lock()
+        self.refresh_keyring()
+    
+    def _derive_key(self, password: bytes, salt: bytes = b'stable_salt_for_auth_tool') -> bytes:
+        digest = hashlib.sha256(salt + b'\0' + password).hexdigest()
+        with _derived_keys_lock:
+            key = _derived_keys.get(digest)
+            if key is not None:
+                return key
+            
+            def derive() -> bytes:
+                kdf = PBKDF2HMAC(
+                    algorithm=hashes.SHA256(),
+                    length=32,
+                    salt=salt,
+                    iterations=100000,
+                )
+                return base64.urlsafe_b64encode(kdf.derive(password))
+            
+            if self.kdf_cache_file:
+                seal_key = config.KDF_CACHE_SEAL_KEY.encode() if config.KDF_CACHE_SEAL_KEY else None
+                key = SealedKeyCache(self.kdf_cache_file, seal_key).get_or_derive(password, salt, derive)
+            else:
+                key = derive()
+            
+            _derived_keys[digest] = key
+            return key
     
     def _get_or_create_key(self) -> bytes:
-        key_file = 'encryption.key'
+        key_file = self.key_file
         if os.path.exists(key_file):
             with open(key_file, 'rb') as f:
                 return f.read()
@@ -34,15 +110,164 @@ class EncryptionService:
                 f.write(key)
             return key
     
+    @property
+    def key_id(self) -> str:
+        # 키링이 어느 버전 1 키로 래핑됐는지 구분하는 지문 (키 자체는 드러나지 않는다)
+        return hashlib.sha256(self.key).hexdigest()[:16]
+    
+    def refresh_keyring(self):
+        # 다른 워커가 키를 교체했을 수 있으므로 파일이 바뀌었을 때만 다시 읽는다
+        if not os.path.exists(self.keyring_file):
+            return
+        with self._keyring_lock:
+            mtime = os.path.getmtime(self.keyring_file)
+            if mtime == self._keyring_mtime:
+                return
+            keyring = self._read_keyring()
+            if keyring["keys"] and "wrapped_by" not in keyring:
+                # 이전 버전은 교체된 마스터 키를 평문으로 저장했으므로 버전 1 키로 래핑해 다시 쓴다
+                with file_lock(f"{self.keyring_file}.lock"):
+                    keyring = self._read_keyring()
+                    if "wrapped_by" not in keyring:
+                        self.write_keyring(self.keyring_file, keyring["active"], self._unwrap_keyring(keyring))
+                    mtime = os.path.getmtime(self.keyring_file)
+                    keyring = self._read_keyring()
+            
+            rotated_keys = self._unwrap_keyring(keyring)
+            master_keys = {LEGACY_KEY_VERSION: self.cipher_suite}
+            for version, key in rotated_keys.items():
+                master_keys[version] = Fernet(key)
+            self.rotated_keys = rotated_keys
+            self.master_keys = master_keys
+            self.active_version = keyring["active"]
+            self._keyring_mtime = mtime
+    
+    def _read_keyring(self) -> dict:
+        if not os.path.exists(self.keyring_file):
+            return {"active": LEGACY_KEY_VERSION, "keys": {}}
+        with open(self.keyring_file, 'r') as f:
+            return json.load(f)
+    
+    def _unwrap_keyring(self, keyring: dict) -> Dict[int, bytes]:
+        wrapped_by = keyring.get("wrapped_by")
+        if wrapped_by is None:
+            return {int(version): key.encode() for version, key in keyring["keys"].items()}
+        if wrapped_by != self.key_id:
+            raise ValueError(
+                f"{self.keyring_file} is wrapped with a different master key. "
+                "Run 'python migrate_accounts.py --to-master-key' after changing MASTER_KEY."
+            )
+        return {int(version): self.cipher_suite.decrypt(key.encode()) for version, key in keyring["keys"].items()}
+    
+    def write_keyring(self, path: str, active_version: int, rotated_keys: Dict[int, bytes]):
+        # 교체된 마스터 키는 버전 1 키(encryption.key 또는 MASTER_KEY 파생 키)로 래핑해서만 디스크에 둔다
+        keyring = {
+            "active": active_version,
+            "wrapped_by": self.key_id,
+            "keys": {str(version): self.cipher_suite.encrypt(key).decode() for version, key in rotated_keys.items()}
+        }
+        write_private_file(path, json.dumps(keyring).encode())
+    
+    def add_master_key(self) -> int:
+        with file_lock(f"{self.keyring_file}.lock"):
+            rotated_keys = self._unwrap_keyring(self._read_keyring())
+            version = max([LEGACY_KEY_VERSION] + list(rotated_keys)) + 1
+            rotated_keys[version] = Fernet.generate_key()
+            self.write_keyring(self.keyring_file, version, rotated_keys)
+        with self._keyring_lock:
+            self._keyring_mtime = None
+        self.refresh_keyring()
+        return version
+    
+    def _master_key(self, version: int) -> Fernet:
+        master_key = self.master_keys.get(version)
+        if master_key is None:
+            self.refresh_keyring()
+            master_key = self.master_keys.get(version)
+            if master_key is None:
+                raise ValueError(f"Unknown master key version: {version}")
+        return master_key
+    
+    @timed(crypto_duration, operation="generate_data_key")
+    def generate_data_key(self) -> Tuple[bytes, str, int]:
+        self.refresh_keyring()
+        data_key = AESGCM.generate_key(bit_length=256)
+        version = self.active_version
+        wrapped_key = self._master_key(version).encrypt(data_key).decode()
+        return data_key, wrapped_key, version
+    
+    @timed(crypto_duration, operation="unwrap_data_key")
+    def unwrap_data_key(self, wrapped_key: str, version: int) -> bytes:
+        return self._master_key(version).decrypt(wrapped_key.encode())
+    
+    @timed(crypto_duration, operation="rewrap_data_key")
+    def rewrap_data_key(self, wrapped_key: str, version: int) -> Tuple[str, int]:
+        data_key = self.unwrap_data_key(wrapped_key, version)
+        active_version = self.active_version
+        return self._master_key(active_version).encrypt(data_key).decode(), active_version
+    
+    @timed(crypto_duration, operation="encrypt_with_data_key")
+    def encrypt_with_data_key(self, data_key: bytes, plaintext: str) -> str:
+        return self._seal(AESGCM(data_key), plaintext)
+    
+    @timed(crypto_duration, operation="decrypt_with_data_key")
+    def decrypt_with_data_key(self, data_key: bytes, encrypted_text: str) -> str:
+        if is_current_format(encrypted_text):
+            return self._open(AESGCM(data_key), encrypted_text)
+        # 이전 버전에서 만든 데이터 키는 Fernet 키다
+        return Fernet(data_key).decrypt(encrypted_text.encode()).decode()
+    
+    def _seal(self, aead: AESGCM, plaintext: str) -> str:
+        nonce = os.urandom(NONCE_SIZE)
+        encrypted_data = nonce + aead.encrypt(nonce, plaintext.encode(), None)
+        return CIPHERTEXT_PREFIX + base64.urlsafe_b64encode(encrypted_data).decode()
+    
+    def _open(self, aead: AESGCM, encrypted_text: str) -> str:
+        encrypted_data = base64.urlsafe_b64decode(encrypted_text[len(CIPHERTEXT_PREFIX):])
+        return aead.decrypt(encrypted_data[:NONCE_SIZE], encrypted_data[NONCE_SIZE:], None).decode()
+    
+    @timed(crypto_duration, operation="encrypt")
     def encrypt(self, plaintext: str) -> str:
-        encrypted_data = self.cipher_suite.encrypt(plaintext.encode())
-        return base64.urlsafe_b64encode(encrypted_data).decode()
+        return self._seal(self.aead, plaintext)
     
+    @timed(crypto_duration, operation="decrypt")
     def decrypt(self, encrypted_text: str) -> str:
+        if is_current_format(encrypted_text):
+            return self._open(self.aead, encrypted_text)
         encrypted_data = base64.urlsafe_b64decode(encrypted_text.encode())
         decrypted_data = self.cipher_suite.decrypt(encrypted_data)
         return decrypted_data.decode()
     
+    def run_batch(self, func: Callable[[T], R], items: Sequence[T]) -> List[R]:
+        # cryptography는 암복호화 중 GIL을 놓으므로 큰 배치는 워커 스레드에 나눠 처리한다
+        items = list(items)
+        if self.workers <= 1 or len(items) < PARALLEL_BATCH_THRESHOLD:
+            return [func(item) for item in items]
+        
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crypto")
+            executor = self._executor
+        
+        chunk_size = -(-len(items) // self.workers)
+        futures = [
+            executor.submit(lambda part: [func(item) for item in part], items[start:start + chunk_size])
+            for start in range(0, len(items), chunk_size)
+        ]
+        return [result for future in futures for result in future.result()]
+    
+    def encrypt_many(self, plaintexts: Sequence[str]) -> List[str]:
+        return self.run_batch(self.encrypt, plaintexts)
+    
+    def decrypt_many(self, encrypted_texts: Sequence[str]) -> List[str]:
+        return self.run_batch(self.decrypt, encrypted_texts)
+    
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+    
     def is_valid_encrypted_data(self, encrypted_text: str) -> bool:
         try:
             self.decrypt(encrypted_text)
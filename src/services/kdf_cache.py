@@ -0,0 +1,90 @@
+import hashlib
+import hmac
+import json
+import os
+from contextlib import contextmanager
+from typing import Callable, Optional
+from cryptography.fernet import Fernet, InvalidToken
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+@contextmanager
+def file_lock(path: str):
+    with open(path, 'a+b') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def write_private_file(path: str, data: bytes):
+    temp_path = f"{path}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+# PBKDF2 결과를 봉인 키로 암호화해 파일에 보관한다. 항목 이름도 봉인 키로 HMAC 처리한다.
+# seal_key(KDF_CACHE_SEAL_KEY)를 주면 디스크에는 캐시 파일만 남으므로 캐시 파일을 가져가도 열 수 없다.
+# 생략하면 봉인 키를 캐시 옆의 <cache_file>.key에 만들어 두는데, 이때는 캐시 파일만 유출된 경우만 막아 주며
+# 디렉터리 전체를 읽을 수 있는 사람에게는 파생 키가 그대로 노출된다.
+class SealedKeyCache:
+    def __init__(self, cache_file: str, seal_key: Optional[bytes] = None, seal_key_file: Optional[str] = None):
+        self.cache_file = cache_file
+        self.seal_key = seal_key
+        self.seal_key_file = seal_key_file or f"{cache_file}.key"
+        self.lock_file = f"{cache_file}.lock"
+    
+    def get_or_derive(self, password: bytes, salt: bytes, derive: Callable[[], bytes]) -> bytes:
+        # 여러 워커가 동시에 기동해도 잠금을 쥔 한 프로세스만 파생하고 나머지는 결과를 읽는다
+        with file_lock(self.lock_file):
+            seal_key = self._read_seal_key()
+            if seal_key is None:
+                seal_key = Fernet.generate_key()
+                write_private_file(self.seal_key_file, seal_key)
+            
+            entry_id = self._entry_id(seal_key, password, salt)
+            entries = self._read_entries()
+            token = entries.get(entry_id)
+            if token is not None:
+                try:
+                    return Fernet(seal_key).decrypt(token.encode())
+                except InvalidToken:
+                    pass
+            
+            derived_key = derive()
+            entries[entry_id] = Fernet(seal_key).encrypt(derived_key).decode()
+            write_private_file(self.cache_file, json.dumps(entries).encode())
+            return derived_key
+    
+    def _entry_id(self, seal_key: bytes, password: bytes, salt: bytes) -> str:
+        return hmac.new(seal_key, salt + b'\0' + password, hashlib.sha256).hexdigest()
+    
+    def _read_seal_key(self) -> Optional[bytes]:
+        if self.seal_key:
+            return self.seal_key
+        if not os.path.exists(self.seal_key_file):
+            return None
+        with open(self.seal_key_file, 'rb') as f:
+            return f.read()
+    
+    def _read_entries(self) -> dict:
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'rb') as f:
+                return json.loads(f.read() or b'{}')
+        except ValueError:
+            return {}
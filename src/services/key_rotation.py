@@ -0,0 +1,150 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import or_, update
+from ..models.database import Account
+from .account_manager import AccountManager
+
+class KeyRotationJob:
+    def __init__(self, account_manager: AccountManager, chunk_size: int = 200, pause: float = 0.0):
+        self.account_manager = account_manager
+        self.db_manager = account_manager.db_manager
+        self.encryption_service = account_manager.encryption_service
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._progress: Dict = {"status": "idle"}
+    
+    def rotate(self) -> bool:
+        # 동시에 들어온 요청이 각각 새 마스터 키를 추가하지 않도록 확인, 추가, 시작을 한 번에 처리한다
+        with self._lock:
+            if self.is_running():
+                return False
+            self.encryption_service.add_master_key()
+            self._start()
+            return True
+    
+    def start(self) -> bool:
+        with self._lock:
+            if self.is_running():
+                return False
+            self._start()
+            return True
+    
+    def _start(self):
+        # 스레드가 진행 상황을 채우기 전에 조회해도 시작된 작업으로 보이게 한다
+        self._progress = {"status": "running", "started_at": datetime.utcnow()}
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run_safely, name="key-rotation", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def progress(self) -> Dict:
+        progress = dict(self._progress)
+        progress["pending"] = self._count_pending()
+        return progress
+    
+    def _pending_filter(self, version: int):
+        return or_(Account.key_version == None, Account.key_version != version)
+    
+    def _count_pending(self) -> int:
+        session = self.db_manager.get_session()
+        try:
+            self.encryption_service.refresh_keyring()
+            version = self.encryption_service.active_version
+            return session.query(Account.id).filter(self._pending_filter(version)).count()
+        finally:
+            self.db_manager.close_session(session)
+    
+    def _run_safely(self):
+        try:
+            self.run()
+        except Exception as e:
+            self._progress.update(status="failed", error=str(e), finished_at=datetime.utcnow())
+    
+    def run(self):
+        # 완료 여부를 key_version으로 판단하므로 중단 후 다시 시작해도 남은 계정부터 이어서 처리된다
+        self.encryption_service.refresh_keyring()
+        version = self.encryption_service.active_version
+        self._progress = {
+            "status": "running",
+            "target_version": version,
+            "total": self._count_pending(),
+            "processed": 0,
+            "skipped": 0,
+            "started_at": datetime.utcnow(),
+        }
+        last_id = 0
+        while not self._stop_event.is_set():
+            processed, skipped, last_id = self._rotate_chunk(version, last_id)
+            if processed + skipped == 0:
+                break
+            self._progress["processed"] += processed
+            self._progress["skipped"] += skipped
+            if self.pause:
+                time.sleep(self.pause)
+        
+        status = "stopped" if self._stop_event.is_set() else "completed"
+        self._progress.update(status=status, finished_at=datetime.utcnow())
+    
+    def _rotated_values(self, db_account: Account) -> Dict:
+        if db_account.encrypted_data_key is None:
+            # 이전 형식 계정은 데이터 키 방식으로 다시 암호화한다
+            return self.account_manager.seal_credentials(
+                *self.account_manager.unseal_credentials(db_account)
+            )
+        wrapped_key, new_version = self.encryption_service.rewrap_data_key(
+            db_account.encrypted_data_key, db_account.key_version
+        )
+        return {"encrypted_data_key": wrapped_key, "key_version": new_version}
+    
+    def _rotate_chunk(self, version: int, last_id: int):
+        table = Account.__table__
+        session = self.db_manager.get_session()
+        try:
+            rows = session.query(Account).filter(
+                Account.id > last_id,
+                self._pending_filter(version)
+            ).order_by(Account.id).limit(self.chunk_size).all()
+            if not rows:
+                return 0, 0, last_id
+            
+            # commit()이 읽어 온 행을 만료시키므로 다른 프로세스가 삭제해도 읽을 수 있게 미리 꺼내 둔다
+            last_id = rows[-1].id
+            processed = skipped = 0
+            new_values = self.encryption_service.run_batch(self._rotated_values, rows)
+            for db_account, values in zip(rows, new_values):
+                if db_account.encrypted_data_key is None:
+                    guard = table.c.encrypted_data_key == None
+                else:
+                    guard = table.c.encrypted_data_key == db_account.encrypted_data_key
+                
+                # 처리 중에 계정이 수정됐다면 덮어쓰지 않는다. updated_at은 내용 변경이 아니므로 유지한다
+                result = session.execute(
+                    update(table)
+                    .where(table.c.id == db_account.id, guard)
+                    .values(updated_at=table.c.updated_at, **values)
+                )
+                if result.rowcount:
+                    processed += 1
+                else:
+                    skipped += 1
+            
+            session.commit()
+            return processed, skipped, last_id
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.db_manager.close_session(session)
@@ -0,0 +1,176 @@
+import cProfile
+import collections
+import contextvars
+import functools
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional
+from config import config
+
+CPROFILE = "cprofile"
+SAMPLER = "sampler"
+MODES = (CPROFILE, SAMPLER)
+
+# 미들웨어가 샘플링하기로 정한 요청에만 프로파일러 종류를 설정한다 (스레드풀 실행에도 컨텍스트가 복사됨)
+current_mode: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("profiling_mode", default=None)
+
+class RouteProfile:
+    def __init__(self):
+        self.requests = 0
+        self.stats: Optional[pstats.Stats] = None
+        self.stacks: collections.Counter = collections.Counter()
+        self.stack_samples = 0
+
+class ProfileStore:
+    # 라우트별로 cProfile 통계를 합치고, 스택 샘플은 collapsed 형식(a;b;c 개수)으로 센다
+    def __init__(self):
+        self._routes: Dict[str, RouteProfile] = {}
+        self._lock = threading.Lock()
+    
+    def _route(self, route: str) -> RouteProfile:
+        profile = self._routes.get(route)
+        if profile is None:
+            profile = self._routes[route] = RouteProfile()
+        return profile
+    
+    def add_profile(self, route: str, profiler: cProfile.Profile):
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        with self._lock:
+            profile = self._route(route)
+            profile.requests += 1
+            if profile.stats is None:
+                profile.stats = stats
+            else:
+                profile.stats.add(stats)
+    
+    def add_request(self, route: str):
+        with self._lock:
+            self._route(route).requests += 1
+    
+    def add_stack(self, route: str, stack: str):
+        with self._lock:
+            profile = self._route(route)
+            profile.stacks[stack] += 1
+            profile.stack_samples += 1
+    
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                route: {
+                    "requests": profile.requests,
+                    "profiled_calls": profile.stats.total_calls if profile.stats is not None else 0,
+                    "stack_samples": profile.stack_samples
+                }
+                for route, profile in sorted(self._routes.items())
+            }
+    
+    def export_pstats(self, route: str) -> Optional[bytes]:
+        # pstats.Stats.dump_stats와 같은 marshal 형식이라 pstats/snakeviz로 바로 열 수 있다
+        with self._lock:
+            profile = self._routes.get(route)
+            if profile is None or profile.stats is None:
+                return None
+            return marshal.dumps(profile.stats.stats)
+    
+    def export_collapsed(self, route: str) -> Optional[bytes]:
+        with self._lock:
+            profile = self._routes.get(route)
+            if profile is None or not profile.stacks:
+                return None
+            lines = [f"{stack} {count}" for stack, count in profile.stacks.most_common()]
+        return ("\n".join(lines) + "\n").encode()
+    
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+class StackSampler:
+    # 프로파일링 중인 요청 스레드만 주기적으로 스택을 떠서 센다. 추적 대상이 없으면 샘플러 스레드도 종료된다.
+    def __init__(self, store: ProfileStore, interval: float = 0.005):
+        self.store = store
+        self.interval = interval
+        self._targets: Dict[int, tuple] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def start(self, route: str, root_frame):
+        with self._lock:
+            self._targets[threading.get_ident()] = (route, root_frame)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+    
+    def stop(self):
+        with self._lock:
+            self._targets.pop(threading.get_ident(), None)
+    
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                targets = list(self._targets.items())
+            
+            frames = sys._current_frames()
+            for ident, (route, root_frame) in targets:
+                stack = []
+                frame = frames.get(ident)
+                # 엔드포인트를 감싼 프레임 아래쪽(핸들러와 그 호출)만 남긴다
+                while frame is not None and frame is not root_frame:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack and frame is root_frame:
+                    self.store.add_stack(route, ";".join(reversed(stack)))
+            del frames
+            time.sleep(self.interval)
+
+profile_store = ProfileStore()
+sampler = StackSampler(profile_store, interval=config.PROFILING_SAMPLE_INTERVAL)
+
+# Python 3.12부터 cProfile은 sys.monitoring을 써서 프로세스 전체에 하나만 켤 수 있다.
+# 이미 다른 요청이 cProfile을 쓰고 있으면 기다리지 않고 스택 샘플러로 대신 측정한다.
+_cprofile_lock = threading.Lock()
+
+def _sample(route: str, func: Callable, args, kwargs):
+    profile_store.add_request(route)
+    sampler.start(route, sys._getframe())
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sampler.stop()
+
+def profiled(route: str, func: Callable) -> Callable:
+    # 동기 엔드포인트는 스레드풀 스레드에서 실행되므로 그 스레드 안에서 프로파일러를 켠다.
+    # 샘플링되지 않은 요청은 ContextVar 조회 한 번만 추가된다.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        mode = current_mode.get()
+        if mode is None:
+            return func(*args, **kwargs)
+        
+        if mode == SAMPLER or not _cprofile_lock.acquire(blocking=False):
+            return _sample(route, func, args, kwargs)
+        
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # 요청 밖의 다른 프로파일링 도구가 켜져 있으면 요청은 그대로 처리한다
+                return _sample(route, func, args, kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                profile_store.add_profile(route, profiler)
+        finally:
+            _cprofile_lock.release()
+    wrapper.__profiled__ = True
+    return wrapper
\ No newline at end of file
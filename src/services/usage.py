@@ -0,0 +1,78 @@
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update
+from ..models.database import ApiKey, DatabaseManager
+
+class LastUsedBuffer:
+    def __init__(self, db_manager: DatabaseManager, flush_interval: float = 30.0):
+        self.db_manager = db_manager
+        self.flush_interval = flush_interval
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def record(self, key_id: int, used_at: Optional[datetime] = None):
+        with self._lock:
+            self._pending[key_id] = used_at or datetime.utcnow()
+        if self.flush_interval <= 0:
+            self.flush()
+    
+    def get(self, key_id: int) -> Optional[datetime]:
+        # 아직 DB에 쓰지 않은 사용 시각
+        with self._lock:
+            return self._pending.get(key_id)
+    
+    def discard(self, key_id: int):
+        with self._lock:
+            self._pending.pop(key_id, None)
+    
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        
+        table = ApiKey.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("key_id"))
+            .values(last_used=bindparam("used_at"))
+        )
+        params = [{"key_id": key_id, "used_at": used_at} for key_id, used_at in pending.items()]
+        
+        session = self.db_manager.get_session()
+        try:
+            session.execute(statement, params)
+            session.commit()
+        except Exception:
+            session.rollback()
+            with self._lock:
+                for key_id, used_at in pending.items():
+                    self._pending.setdefault(key_id, used_at)
+            raise
+        finally:
+            self.db_manager.close_session(session)
+        return len(pending)
+    
+    def start(self):
+        if self.flush_interval <= 0 or self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="last-used-flusher", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
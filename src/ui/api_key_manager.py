@@ -73,7 +73,7 @@ class ApiKeyManagerDialog:
             self.tree.delete(*self.tree.get_children())
             
             for key in api_keys:
-                masked_key = key.api_key[:12] + "*" * (len(key.api_key) - 16) + key.api_key[-4:]
+                masked_key = (key.key_prefix or "") + "*" * 56
                 last_used = key.last_used.strftime("%Y-%m-%d %H:%M") if key.last_used else "사용 안함"
                 
                 self.tree.insert("", tk.END, values=(
@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox, simpledialog
 import threading
 import requests
 from typing import List
+from config import config
 from ..services.account_manager import AccountManager
 from ..services.auth import AuthService
 from ..services.encryption import EncryptionService
@@ -25,7 +26,11 @@ class MainWindow:
     def setup_services(self):
         self.db_manager = DatabaseManager()
         self.encryption_service = EncryptionService()
-        self.account_manager = AccountManager(self.db_manager, self.encryption_service)
+        self.account_manager = AccountManager(
+            self.db_manager,
+            self.encryption_service,
+            payload_mode=config.ACCOUNT_STORAGE_MODE == "payload"
+        )
         self.auth_service = AuthService(self.db_manager)
         self.full_api_keys = {}  # API 키 전체 텍스트 저장용
     
@@ -148,11 +153,9 @@ class MainWindow:
         try:
             api_keys = self.auth_service.list_api_keys()
             self.api_key_tree.delete(*self.api_key_tree.get_children())
-            self.full_api_keys = {}  # 전체 API 키를 저장할 딕셔너리
             
             for key in api_keys:
-                self.full_api_keys[key.key_name] = key.api_key  # 전체 키 저장
-                masked_key = key.api_key[:8] + "*" * (len(key.api_key) - 12) + key.api_key[-4:]
+                masked_key = (key.key_prefix or "") + "*" * 56
                 self.api_key_tree.insert("", tk.END, values=(
                     key.key_name,
                     masked_key,
@@ -224,6 +227,7 @@ class MainWindow:
             try:
                 key_data = ApiKeyCreate(key_name=key_name)
                 result = self.auth_service.create_api_key(key_data)
+                self.full_api_keys[result.key_name] = result.api_key  # 평문 키는 생성 직후에만 알 수 있다
                 self.refresh_api_keys()
                 
                 self.show_api_key_dialog(result.api_key)
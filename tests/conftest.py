@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from config import config
+from src.api.dependencies import ServiceContainer, init_container, shutdown_container
+from src.models.database import DatabaseManager
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # 서비스들이 encryption.key, api_key.secret 등을 현재 디렉터리에 만들므로 테스트마다 임시 디렉터리에서 실행한다
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "MASTER_KEY", None)
+    return tmp_path
+
+@pytest.fixture
+def container(workdir):
+    # httpx.ASGITransport는 lifespan을 실행하지 않으므로 컨테이너를 직접 만든다
+    container = init_container(ServiceContainer(db_manager=DatabaseManager(db_path=str(workdir / "test.db"))))
+    yield container
+    shutdown_container()
+
+@pytest.fixture
+def api_key(container) -> str:
+    from src.models.account import ApiKeyCreate
+    return container.auth_service.create_api_key(ApiKeyCreate(key_name="tests")).api_key
@@ -0,0 +1,126 @@
+import asyncio
+import httpx
+import pytest
+from src.api.main import app
+from src.client.async_auth_client import AsyncAuthClient
+from src.client.auth_client import (
+    AuthClientError, AuthenticationError, NotFoundError, ServiceUnavailableError
+)
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def client_for(api_key: str) -> AsyncAuthClient:
+    return AsyncAuthClient(api_key, "http://testserver", transport=httpx.ASGITransport(app=app))
+
+def test_account_crud_round_trip(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            created = await client.create_account("github", "octocat", "secret")
+            assert created["alias"] == "github"
+            assert await client.get_account("github") == {
+                "alias": "github", "username": "octocat", "password": "secret"
+            }
+            
+            await client.update_account("github", password="changed")
+            assert (await client.get_account("github"))["password"] == "changed"
+            
+            assert await client.delete_account("github") is True
+            assert await client.get_account("github") is None
+            assert await client.delete_account("github") is False
+    run(scenario())
+
+def test_conditional_get_reuses_cached_response(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            await client.create_account("mail", "user", "pw")
+            first = await client._conditional_get("/accounts/mail")
+            second = await client._conditional_get("/accounts/mail")
+            assert second is first
+            
+            await client.update_account("mail", password="new")
+            assert (await client.get_account("mail"))["password"] == "new"
+    run(scenario())
+
+def test_batch_and_chunked_lookup_report_missing_aliases(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            result = await client.import_accounts(
+                [{"alias": f"svc{index:02d}", "username": f"user{index}", "password": "pw"} for index in range(12)]
+            )
+            assert result["created"] == 12
+            
+            accounts = await client.get_accounts(["svc00", "missing", "svc05"])
+            assert list(accounts) == ["svc00", "missing", "svc05"]
+            assert accounts["missing"] is None
+            assert accounts["svc05"]["username"] == "user5"
+            
+            aliases = [f"svc{index:02d}" for index in range(12)] + ["missing"]
+            chunked = await client.get_accounts_chunked(aliases, batch_size=5)
+            assert list(chunked) == aliases
+            assert sum(account is not None for account in chunked.values()) == 12
+    run(scenario())
+
+def test_iter_accounts_follows_cursor(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            await client.import_accounts(
+                [{"alias": f"p{index:02d}", "username": "u", "password": "pw"} for index in range(7)]
+                + [{"alias": "other", "username": "u", "password": "pw"}]
+            )
+            aliases = [account["alias"] async for account in client.iter_accounts(page_size=3, prefix="p")]
+            assert aliases == [f"p{index:02d}" for index in range(7)]
+            assert len(await client.list_accounts(limit=2)) == 2
+    run(scenario())
+
+def test_change_feed_cursor(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            _, cursor = await client.get_changes()
+            await client.create_account("feed", "u", "pw")
+            await client.delete_account("feed")
+            changes, next_cursor = await client.get_changes(cursor, resource="account")
+            assert [(change["key"], change["action"]) for change in changes] == [
+                ("feed", "created"), ("feed", "deleted")
+            ]
+            assert next_cursor > cursor
+            assert await client.get_changes(next_cursor) == ([], next_cursor)
+    run(scenario())
+
+def test_errors_use_client_error_hierarchy(api_key):
+    async def scenario():
+        async with client_for(api_key) as client:
+            await client.create_account("dup", "u", "pw")
+            with pytest.raises(AuthClientError) as excinfo:
+                await client.create_account("dup", "u", "pw")
+            assert excinfo.value.status_code == 400
+            
+            with pytest.raises(NotFoundError) as excinfo:
+                await client.update_account("missing", password="pw")
+            assert excinfo.value.status_code == 404
+        
+        async with client_for("invalid-key") as client:
+            assert await client.validate_api_key() is False
+            with pytest.raises(AuthenticationError) as excinfo:
+                await client.get_account("dup")
+            assert excinfo.value.status_code == 401
+    run(scenario())
+
+def test_transport_failure_raises_service_unavailable():
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+    
+    async def scenario():
+        async with AsyncAuthClient("key", "http://testserver", transport=httpx.MockTransport(refuse)) as client:
+            with pytest.raises(ServiceUnavailableError):
+                await client.get_account("any")
+            with pytest.raises(ServiceUnavailableError):
+                await client.get_changes(0)
+    run(scenario())
+
+def test_http2_client_can_be_created():
+    # requirements.txt의 httpx[http2]가 h2를 함께 설치해야 한다
+    async def scenario():
+        async with AsyncAuthClient("unused", http2=True) as client:
+            assert client.client is not None
+    run(scenario())
@@ -0,0 +1,42 @@
+from src.models.account import ApiKeyCreate
+from src.models.database import DatabaseManager
+from src.services.auth import AuthService
+
+def test_deactivate_during_validation_is_not_recached(workdir):
+    db_manager = DatabaseManager(db_path=str(workdir / "auth.db"))
+    auth_service = AuthService(db_manager)
+    try:
+        api_key = auth_service.create_api_key(ApiKeyCreate(key_name="racy")).api_key
+        close_session = db_manager.close_session
+        
+        def deactivate_after_read(session):
+            # 검증 요청이 활성 키를 읽은 직후, 캐시에 넣기 전에 다른 요청이 키를 비활성화한다
+            close_session(session)
+            db_manager.close_session = close_session
+            assert auth_service.deactivate_api_key("racy")
+        
+        db_manager.close_session = deactivate_after_read
+        assert auth_service.validate_api_key(api_key)
+        assert len(auth_service.key_cache) == 0
+        assert not auth_service.validate_api_key(api_key)
+    finally:
+        auth_service.last_used.stop()
+        db_manager.dispose()
+
+def test_list_api_keys_reports_last_used(workdir):
+    db_manager = DatabaseManager(db_path=str(workdir / "auth.db"))
+    auth_service = AuthService(db_manager, last_used_flush_interval=60)
+    try:
+        api_key = auth_service.create_api_key(ApiKeyCreate(key_name="used")).api_key
+        auth_service.create_api_key(ApiKeyCreate(key_name="unused"))
+        assert auth_service.validate_api_key(api_key)
+        
+        # 플러시 전에는 버퍼의 값을, 플러시 뒤에는 DB의 값을 돌려준다
+        pending = {key.key_name: key.last_used for key in auth_service.list_api_keys()}
+        assert pending["used"] is not None and pending["unused"] is None
+        auth_service.last_used.flush()
+        flushed = {key.key_name: key.last_used for key in auth_service.list_api_keys()}
+        assert flushed == pending
+    finally:
+        auth_service.last_used.stop()
+        db_manager.dispose()
@@ -0,0 +1,214 @@
+import base64
+import os
+import threading
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, String, Table, Text, create_engine, inspect
+from sqlalchemy.pool import QueuePool, StaticPool
+from config import config
+from src.models.account import AccountCreate
+from src.models.database import Base, ChangeLog, DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.auth import AuthService
+from src.services.changes import ChangeFeed
+from src.services.encryption import EncryptionService
+
+# TEST_DATABASE_URL에 PostgreSQL 등 서버형 DB URL을 지정하면 같은 테스트를 그 DB에서도 실행한다 (테이블을 지우므로 테스트 전용 DB를 쓸 것)
+SERVER_URL = os.getenv("TEST_DATABASE_URL")
+
+@pytest.fixture(params=["sqlite-file", "server"])
+def database_url(request, workdir):
+    if request.param == "sqlite-file":
+        yield f"sqlite:///{workdir / 'integration.db'}"
+        return
+    if not SERVER_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(SERVER_URL)
+    Base.metadata.drop_all(engine)
+    yield SERVER_URL
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+def test_database_url_from_config_uses_queue_pool(database_url, monkeypatch):
+    monkeypatch.setattr(config, "DATABASE_URL", database_url)
+    monkeypatch.setattr(config, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(config, "DB_MAX_OVERFLOW", 2)
+    db_manager = DatabaseManager()
+    try:
+        pool = db_manager.engine.pool
+        assert isinstance(pool, QueuePool)
+        assert pool.size() == 3
+        assert pool._max_overflow == 2
+        assert pool._pre_ping is config.DB_POOL_PRE_PING
+        assert set(inspect(db_manager.engine).get_table_names()) >= {"accounts", "api_keys", "change_log"}
+    finally:
+        db_manager.dispose()
+
+def test_default_pool_covers_threadpool_and_background_threads(database_url, monkeypatch):
+    # 스레드풀의 모든 요청과 백그라운드 스레드가 동시에 연결을 쥐어도 풀에서 기다리지 않아야 한다
+    monkeypatch.setattr(config, "DB_POOL_TIMEOUT", 0.5)
+    db_manager = DatabaseManager(database_url=database_url)
+    connections = []
+    try:
+        for _ in range(config.THREADPOOL_SIZE + config.BACKGROUND_DB_THREADS):
+            connections.append(db_manager.engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+        db_manager.dispose()
+
+def test_concurrent_writers_share_the_pool(database_url):
+    db_manager = DatabaseManager(database_url=database_url, pool_size=4, max_overflow=4)
+    try:
+        manager = AccountManager(db_manager, EncryptionService(workers=1))
+        errors = []
+        
+        def create(worker: int):
+            try:
+                for index in range(10):
+                    manager.create_account(AccountCreate(alias=f"w{worker}-{index}", username="u", password="pw"))
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=create, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert len(manager.list_accounts()) == 80
+        assert db_manager.engine.pool.checkedout() == 0
+    finally:
+        db_manager.dispose()
+
+def test_add_missing_columns_upgrades_previous_schema(database_url):
+    # 데이터 키, payload, API 키 해시 컬럼이 생기기 전의 스키마와 데이터를 만든다
+    encryption_service = EncryptionService(workers=1)
+    legacy_encrypt = lambda value: base64.urlsafe_b64encode(
+        encryption_service.cipher_suite.encrypt(value.encode())
+    ).decode()
+    raw_key = "k" * 64
+    
+    metadata = MetaData()
+    accounts = Table(
+        "accounts", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("alias", String(50), unique=True, nullable=False),
+        Column("encrypted_username", Text, nullable=False),
+        Column("encrypted_password", Text, nullable=False),
+        Column("created_at", DateTime),
+        Column("updated_at", DateTime),
+    )
+    api_keys = Table(
+        "api_keys", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("key_name", String(50), unique=True, nullable=False),
+        Column("api_key", String(64), unique=True, nullable=False),
+        Column("is_active", Boolean),
+        Column("created_at", DateTime),
+    )
+    engine = create_engine(database_url)
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        now = datetime.utcnow()
+        connection.execute(accounts.insert().values(
+            alias="legacy", encrypted_username=legacy_encrypt("old-user"),
+            encrypted_password=legacy_encrypt("old-pass"), created_at=now, updated_at=now
+        ))
+        connection.execute(api_keys.insert().values(key_name="legacy", api_key=raw_key, is_active=True, created_at=now))
+    engine.dispose()
+    
+    db_manager = DatabaseManager(database_url=database_url)
+    try:
+        inspector = inspect(db_manager.engine)
+        account_columns = {column["name"] for column in inspector.get_columns("accounts")}
+        assert {"encrypted_payload", "encrypted_data_key", "key_version"} <= account_columns
+        api_key_columns = {column["name"] for column in inspector.get_columns("api_keys")}
+        assert {"key_prefix", "last_used"} <= api_key_columns
+        index_columns = {tuple(index["column_names"]) for index in inspector.get_indexes("api_keys")}
+        assert ("key_prefix",) in index_columns
+        
+        manager = AccountManager(db_manager, encryption_service)
+        account = manager.get_account("legacy")
+        assert (account.username, account.password) == ("old-user", "old-pass")
+        # 읽는 시점에 현재 형식으로 다시 저장된다
+        assert manager.reencrypt_outdated() == 0
+        
+        auth_service = AuthService(db_manager, cache_size=0)
+        assert auth_service.validate_api_key(raw_key)
+        assert auth_service.migrate_legacy_keys() == 0
+    finally:
+        db_manager.dispose()
+
+def test_change_feed_holds_cursor_before_uncommitted_ids(database_url):
+    # 서버형 DB는 id를 할당한 순서와 커밋 순서가 다를 수 있다. 빈 id 3을 아직 커밋되지 않은 트랜잭션으로 흉내 낸다
+    db_manager = DatabaseManager(database_url=database_url)
+    try:
+        session = db_manager.get_session()
+        try:
+            for change_id in (1, 2, 4):
+                session.add(ChangeLog(id=change_id, resource="account", key=f"a{change_id}", action="created"))
+            session.commit()
+            
+            feed = ChangeFeed(db_manager, lag=60)
+            changes, cursor = feed.list_changes(0)
+            assert [change.id for change in changes] == [1, 2]
+            assert cursor == 2
+            
+            # lag보다 오래된 빈 id는 롤백된 것으로 보고 건너뛴다
+            session.query(ChangeLog).update({"changed_at": datetime.utcnow() - timedelta(minutes=5)})
+            session.commit()
+            changes, cursor = feed.list_changes(cursor)
+            assert [change.id for change in changes] == [4]
+            assert cursor == 4
+        finally:
+            db_manager.close_session(session)
+    finally:
+        db_manager.dispose()
+
+def test_sqlite_file_applies_performance_pragmas(workdir):
+    db_manager = DatabaseManager(db_path=str(workdir / "pragmas.db"))
+    try:
+        with db_manager.engine.connect() as connection:
+            journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+            busy_timeout = connection.exec_driver_sql("PRAGMA busy_timeout").scalar()
+        assert journal_mode.lower() == config.SQLITE_PRAGMAS["journal_mode"].lower()
+        assert busy_timeout == int(config.SQLITE_PRAGMAS["busy_timeout"])
+    finally:
+        db_manager.dispose()
+
+def test_memory_sqlite_shares_one_connection_across_threads(workdir):
+    db_manager = DatabaseManager(database_url="sqlite://")
+    try:
+        assert isinstance(db_manager.engine.pool, StaticPool)
+        manager = AccountManager(db_manager, EncryptionService(workers=1))
+        thread = threading.Thread(
+            target=manager.create_account, args=(AccountCreate(alias="shared", username="u", password="pw"),)
+        )
+        thread.start()
+        thread.join()
+        assert manager.get_account("shared").username == "u"
+    finally:
+        db_manager.dispose()
+
+def test_prefix_filter_uses_binary_order(database_url):
+    # 와일드카드 문자, 대소문자, 최대 코드 포인트가 섞인 별칭도 접두사가 정확히 일치하는 것만 찾는다
+    db_manager = DatabaseManager(database_url=database_url)
+    try:
+        manager = AccountManager(db_manager, EncryptionService(workers=1))
+        max_char = chr(0x10FFFF)
+        aliases = ["a_b", "axb", "a%c", "aBc", "abc", "abd", f"z{max_char}", f"z{max_char}1", "z"]
+        manager.import_accounts([AccountCreate(alias=alias, username="u", password="pw") for alias in aliases])
+        
+        def matching(prefix: str) -> set:
+            return {account.alias for account in manager.list_accounts(prefix=prefix)}
+        
+        assert matching("a_") == {"a_b"}
+        assert matching("a%") == {"a%c"}
+        assert matching("ab") == {"abc", "abd"}
+        assert matching("aB") == {"aBc"}
+        assert matching(f"z{max_char}") == {f"z{max_char}", f"z{max_char}1"}
+        assert manager.get_collection_version("ab")[1] == 2
+    finally:
+        db_manager.dispose()
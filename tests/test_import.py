@@ -0,0 +1,40 @@
+import io
+import json
+from import_accounts import iter_json_array
+from src.models.account import AccountCreate
+from src.models.database import DatabaseManager
+from src.services import account_manager as account_manager_module
+from src.services.account_manager import AccountManager
+from src.services.encryption import EncryptionService
+
+def test_iter_json_array_streams_across_reads():
+    rows = [{"alias": f"a{index}", "username": "u", "password": "p" * index} for index in range(50)]
+    rows.append(12.5e3)
+    text = json.dumps(rows, indent=2)
+    for read_size in (1, 7, 1 << 16):
+        assert list(iter_json_array(io.StringIO(text), read_size)) == rows
+
+def test_failed_row_does_not_fail_its_chunk(workdir, monkeypatch):
+    manager = AccountManager(DatabaseManager(db_path=str(workdir / "import.db")), EncryptionService(workers=1))
+    try:
+        record_change = account_manager_module.record_change
+        
+        def create_conflict(session, resource, key, action):
+            # 묶음을 쓰는 도중에 다른 연결이 같은 alias를 먼저 만든다
+            if key == "b" and not manager.list_accounts(prefix="b"):
+                monkeypatch.setattr(account_manager_module, "record_change", record_change)
+                manager.create_account(AccountCreate(alias="b", username="other", password="pw"))
+            record_change(session, resource, key, action)
+        
+        monkeypatch.setattr(account_manager_module, "record_change", create_conflict)
+        report = manager.import_accounts(
+            [AccountCreate(alias=alias, username="u", password="pw") for alias in ("a", "b", "c")]
+        )
+        
+        assert [(result.alias, result.status) for result in report.results] == [
+            ("a", "created"), ("b", "error"), ("c", "created")
+        ]
+        assert "INSERT" not in report.results[1].detail
+        assert manager.get_account("b").username == "other"
+    finally:
+        manager.db_manager.dispose()
@@ -0,0 +1,84 @@
+from src.models.account import AccountCreate
+from src.models.database import DatabaseManager
+from src.services.account_manager import AccountManager
+from src.services.encryption import EncryptionService
+from src.services.key_rotation import KeyRotationJob
+
+def make_manager(workdir, count: int) -> AccountManager:
+    manager = AccountManager(DatabaseManager(db_path=str(workdir / "rotation.db")), EncryptionService(workers=1))
+    manager.import_accounts(
+        [AccountCreate(alias=f"acct{index:02d}", username=f"user{index}", password="pw") for index in range(count)]
+    )
+    return manager
+
+def test_rotation_rewraps_every_account(workdir):
+    manager = make_manager(workdir, 12)
+    try:
+        job = KeyRotationJob(manager, chunk_size=5)
+        version = manager.encryption_service.add_master_key()
+        job.run()
+        
+        assert job.progress()["status"] == "completed"
+        assert job.progress()["processed"] == 12
+        assert job.progress()["pending"] == 0
+        assert manager.get_account("acct07").username == "user7"
+        assert version == manager.encryption_service.active_version
+    finally:
+        manager.db_manager.dispose()
+
+def test_rotation_survives_concurrent_delete(workdir):
+    manager = make_manager(workdir, 12)
+    try:
+        job = KeyRotationJob(manager, chunk_size=5)
+        rotated_values = job._rotated_values
+        
+        def delete_chunk_tail(db_account):
+            # 첫 번째 묶음의 마지막 계정을 처리하는 도중에 다른 연결에서 삭제한다
+            if db_account.alias == "acct04":
+                assert manager.delete_account("acct04")
+            return rotated_values(db_account)
+        
+        job._rotated_values = delete_chunk_tail
+        manager.encryption_service.add_master_key()
+        job.run()
+        
+        progress = job.progress()
+        assert progress["status"] == "completed"
+        assert (progress["processed"], progress["skipped"], progress["pending"]) == (11, 1, 0)
+        assert manager.get_account("acct04") is None
+        assert manager.get_account("acct11").username == "user11"
+    finally:
+        manager.db_manager.dispose()
+
+def test_keyring_stores_rotated_keys_wrapped(workdir):
+    manager = make_manager(workdir, 3)
+    try:
+        encryption_service = manager.encryption_service
+        version = encryption_service.add_master_key()
+        manager.create_account(AccountCreate(alias="rotated", username="new-user", password="pw"))
+        
+        with open(encryption_service.keyring_file, "rb") as f:
+            keyring = f.read()
+        assert encryption_service.rotated_keys[version] not in keyring
+        assert EncryptionService(workers=1).rotated_keys == encryption_service.rotated_keys
+        assert manager.get_account("rotated").username == "new-user"
+    finally:
+        manager.db_manager.dispose()
+
+def test_plaintext_keyring_is_wrapped_on_read(workdir):
+    import json
+    from cryptography.fernet import Fernet
+    raw_key = Fernet.generate_key()
+    with open("encryption.keyring", "w") as f:
+        json.dump({"active": 2, "keys": {"2": raw_key.decode()}}, f)
+    
+    manager = make_manager(workdir, 2)
+    try:
+        assert manager.encryption_service.rotated_keys == {2: raw_key}
+        with open("encryption.keyring") as f:
+            keyring = json.load(f)
+        assert keyring["wrapped_by"] == manager.encryption_service.key_id
+        assert raw_key.decode() not in json.dumps(keyring)
+        assert manager.get_account("acct01").username == "user1"
+    finally:
+        manager.db_manager.dispose()